@@ -2,6 +2,9 @@
 Module Compound - Propriétés des composés chimiques
 """
 from thermo.chemical import Chemical
+import math
+import threading
+import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -11,6 +14,9 @@ class Compound:
     Représente un composé chimique avec ses propriétés thermodynamiques
     """
     
+    # Nombre maximal de termes d'enthalpie conservés par composé
+    _ENTHALPY_CACHE_SIZE = 1024
+    
     def __init__(self, name):
         """
         Initialise le composé depuis la base de données thermo
@@ -36,14 +42,73 @@ class Compound:
             # Pour l'enthalpie
             self.Hfus = self.chem.Hfusm if self.chem.Hfusm else 0
             
+            # ln(Psat) tabulé une fois sur le domaine de validité de la
+            # corrélation, interpolé ensuite (quasi exact pour Antoine)
+            self._T_grid, self._lnPsat_grid = self._tabulate_psat()
+            
+            # Coefficients d'Antoine pour les calculs vectorisés
+            self.antoine = self._fit_antoine()
+            
+            # Termes d'enthalpie par (T arrondie, T_ref), voir _enthalpy_terms
+            self._enthalpy_cache = {}
+            self._enthalpy_lock = threading.Lock()
+            
         except Exception as e:
             raise ValueError(f"Impossible de charger le composé '{name}': {e}")
     
+    def _tabulate_psat(self, n_points=1001):
+        """Grille (T, ln Psat) sur [Tmin, Tc] de la corrélation de thermo"""
+        vp = self.chem.VaporPressure
+        T_min, T_max = vp.T_limits.get(vp.method, (0.5 * self.Tb, 1.5 * self.Tb))
+        if self.Tc:
+            T_max = min(T_max, self.Tc)
+        T = np.linspace(T_min, T_max, n_points)
+        P = np.array([vp.T_dependent_property(t) or np.nan for t in T], dtype=float)
+        valid = np.isfinite(P) & (P > 0)
+        if valid.sum() < 2:
+            raise ValueError("pression de vapeur indisponible")
+        return T[valid], np.log(P[valid])
+    
+    def _fit_antoine(self, n_points=25):
+        """Ajuste ln(Psat) = A - B/(T + C) sur Psat de thermo (Pa, K), domaine valide seul"""
+        T_lo = max(0.7 * self.Tb, self._T_grid[0])
+        T_hi = min(1.3 * self.Tb, self._T_grid[-1])
+        if self.Tc:
+            T_hi = min(T_hi, 0.95 * self.Tc)
+        if T_hi <= T_lo:
+            T_lo, T_hi = self._T_grid[0], self._T_grid[-1]
+        T = np.linspace(T_lo, T_hi, n_points)
+        lnP = np.interp(T, self._T_grid, self._lnPsat_grid)
+        # ln(P)·T = A·T + (A·C - B) - C·ln(P), linéaire en (A, A·C - B, C)
+        M = np.column_stack([T, np.ones_like(T), -lnP])
+        (A, AC_minus_B, C), *_ = np.linalg.lstsq(M, lnP * T, rcond=None)
+        return A, A * C - AC_minus_B, C
+    
     def vapor_pressure(self, T):
         """Calcule la pression de vapeur saturante à la température T"""
-        self.chem.T = T
-        Psat = self.chem.Psat
-        return Psat if Psat else 1e-10
+        if self.Tc and T >= self.Tc:
+            # Au-delà du point critique (excursion d'un solveur) : Psat = Pc
+            return self.Pc
+        if self._T_grid[0] <= T <= self._T_grid[-1]:
+            return math.exp(np.interp(T, self._T_grid, self._lnPsat_grid))
+        # Hors grille : corrélation de thermo (pas d'extrapolation bornée)
+        # (T_dependent_property n'écrit pas le cache de thermo, partagé entre threads)
+        Psat = self.chem.VaporPressure.T_dependent_property(T)
+        if Psat:
+            return Psat
+        A, B, C = self.antoine
+        return math.exp(A - B / (T + C))
+    
+    def saturation_temperature(self, P):
+        """Température de saturation à la pression P (inverse de vapor_pressure)"""
+        lnP = math.log(P)
+        if self._lnPsat_grid[0] <= lnP <= self._lnPsat_grid[-1]:
+            return float(np.interp(lnP, self._lnPsat_grid, self._T_grid))
+        try:
+            return self.chem.VaporPressure.solve_property(P)
+        except Exception:
+            A, B, C = self.antoine
+            return B / (A - lnP) - C
     
     def K_value(self, T, P):
         """Calcule le coefficient de partage K = y/x"""
@@ -52,9 +117,8 @@ class Compound:
     
     def enthalpy_liquid(self, T, T_ref=298.15):
         """Calcule l'enthalpie du liquide à T"""
-        self.chem.T = T
         try:
-            Cp_liquid = self.chem.Cplm
+            Cp_liquid = self.chem.HeatCapacityLiquid.T_dependent_property(T)
             H_L = Cp_liquid * (T - T_ref)
             return H_L
         except:
@@ -62,10 +126,26 @@ class Compound:
     
     def enthalpy_vapor(self, T, T_ref=298.15):
         """Calcule l'enthalpie de la vapeur à T"""
-        H_L = self.enthalpy_liquid(T, T_ref)
-        self.chem.T = T
-        Hvap = self.chem.Hvap if self.chem.Hvap else 40000
+        H_L, Hvap = self._enthalpy_terms(T, T_ref)
         return H_L + Hvap
     
+    def _enthalpy_terms(self, T, T_ref=298.15):
+        """(H_L, Hvap) à T arrondie à 0.01 K, mis en cache sur l'instance"""
+        T = round(float(T), 2)
+        key = (T, T_ref)
+        terms = self._enthalpy_cache.get(key)
+        if terms is None:
+            H_L = self.enthalpy_liquid(T, T_ref)
+            # Même grandeur que Chemical.Hvap à T (J/kg), sans modifier self.chem
+            Hvapm = self.chem.EnthalpyVaporization.T_dependent_property(T)
+            Hvap = Hvapm * 1000.0 / self.MW if Hvapm else 40000
+            terms = (H_L, Hvap)
+            # Cache borné, partagé entre threads : modifications sous verrou
+            with self._enthalpy_lock:
+                if len(self._enthalpy_cache) >= self._ENTHALPY_CACHE_SIZE:
+                    self._enthalpy_cache.clear()
+                self._enthalpy_cache[key] = terms
+        return terms
+    
     def __repr__(self):
         return f"Compound(name='{self.name}', Tb={self.Tb-273.15:.1f}°C, MW={self.MW:.2f})"
\ No newline at end of file
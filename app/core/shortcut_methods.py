@@ -1,8 +1,12 @@
 ﻿"""
 Module Shortcut Methods - Méthodes simplifiées (Fenske, Underwood, Gilliland, Kirkbride)
 """
+import logging
+import math
 import numpy as np
-from scipy.optimize import brentq
+from scipy.optimize import toms748
+
+logger = logging.getLogger('distillation_app')
 
 
 class ShortcutDistillation:
@@ -20,21 +24,36 @@ class ShortcutDistillation:
         """Identifie les composés clés (léger et lourd)"""
         T_avg = np.mean([comp.Tb for comp in self.thermo.compounds])
         alpha = self.thermo.relative_volatilities(T_avg, self.P)
-        sorted_indices = np.argsort(alpha)[::-1]
         
         threshold = 0.01
-        for idx in sorted_indices:
-            if self.z_F[idx] > threshold:
-                self.LK_idx = idx
-                break
-        
-        for idx in sorted_indices[::-1]:
-            if self.z_F[idx] > threshold:
-                self.HK_idx = idx
-                break
+        mask = self.z_F > threshold
+        self.LK_idx = int(np.argmax(np.where(mask, alpha, -np.inf)))
+        self.HK_idx = int(np.argmin(np.where(mask, alpha, np.inf)))
     
     def material_balance(self, recovery_LK_D=0.95, recovery_HK_B=0.95):
-        """Calcule les bilans matières globaux"""
+        """Calcule les bilans matières globaux (récupérations scalaires)"""
+        if np.ndim(recovery_LK_D) or np.ndim(recovery_HK_B):
+            raise ValueError("Récupérations scalaires attendues : "
+                             "utiliser material_balance_sweep pour des tableaux")
+        D, B, x_D, x_B = self.material_balance_sweep(recovery_LK_D, recovery_HK_B)
+        
+        self.D = D
+        self.B = B
+        self.x_D = x_D
+        self.x_B = x_B
+        
+        return D, B, x_D, x_B
+    
+    def material_balance_sweep(self, recovery_LK_D, recovery_HK_B):
+        """Bilans matières sans modifier l'état de l'instance
+        
+        Les récupérations peuvent être des tableaux : d et b sont alors diffusés
+        en forme (..., n_comp) pour une étude de sensibilité en un seul appel.
+        """
+        recovery_LK_D = np.asarray(recovery_LK_D, dtype=np.float64)
+        recovery_HK_B = np.asarray(recovery_HK_B, dtype=np.float64)
+        shape = np.broadcast_shapes(recovery_LK_D.shape, recovery_HK_B.shape) + (self.n_comp,)
+        
         LK_in_feed = self.F * self.z_F[self.LK_idx]
         HK_in_feed = self.F * self.z_F[self.HK_idx]
         
@@ -43,39 +62,28 @@ class ShortcutDistillation:
         HK_in_B = recovery_HK_B * HK_in_feed
         HK_in_D = HK_in_feed - HK_in_B
         
-        d = np.zeros(self.n_comp)
-        b = np.zeros(self.n_comp)
-        
-        d[self.LK_idx] = LK_in_D
-        d[self.HK_idx] = HK_in_D
-        b[self.LK_idx] = LK_in_B
-        b[self.HK_idx] = HK_in_B
-        
-        for i in range(self.n_comp):
-            if i != self.LK_idx and i != self.HK_idx:
-                T_avg = np.mean([comp.Tb for comp in self.thermo.compounds])
-                alpha = self.thermo.relative_volatilities(T_avg, self.P)
-                
-                if alpha[i] > alpha[self.LK_idx]:
-                    d[i] = self.F * self.z_F[i]
-                    b[i] = 0
-                elif alpha[i] < alpha[self.HK_idx]:
-                    d[i] = 0
-                    b[i] = self.F * self.z_F[i]
-                else:
-                    ratio = (alpha[i] - alpha[self.HK_idx]) / (alpha[self.LK_idx] - alpha[self.HK_idx])
-                    d[i] = ratio * self.F * self.z_F[i]
-                    b[i] = (1 - ratio) * self.F * self.z_F[i]
-        
-        D = np.sum(d)
-        B = np.sum(b)
-        x_D = d / D
-        x_B = b / B
+        # Composés non-clés : fraction vers le distillat selon la volatilité
+        T_avg = np.mean([comp.Tb for comp in self.thermo.compounds])
+        alpha = self.thermo.relative_volatilities(T_avg, self.P)
+        alpha_LK = alpha[self.LK_idx]
+        alpha_HK = alpha[self.HK_idx]
+        frac_D = np.where(alpha > alpha_LK, 1.0,
+                          np.where(alpha < alpha_HK, 0.0,
+                                   (alpha - alpha_HK) / (alpha_LK - alpha_HK)))
         
-        self.D = D
-        self.B = B
-        self.x_D = x_D
-        self.x_B = x_B
+        f = self.F * self.z_F
+        d = np.broadcast_to(frac_D * f, shape).copy()
+        b = np.broadcast_to((1 - frac_D) * f, shape).copy()
+        
+        d[..., self.LK_idx] = LK_in_D
+        d[..., self.HK_idx] = HK_in_D
+        b[..., self.LK_idx] = LK_in_B
+        b[..., self.HK_idx] = HK_in_B
+        
+        D = d.sum(axis=-1)
+        B = b.sum(axis=-1)
+        x_D = d / np.expand_dims(D, -1)
+        x_B = b / np.expand_dims(B, -1)
         
         return D, B, x_D, x_B
     
@@ -91,7 +99,7 @@ class ShortcutDistillation:
         ratio_D = self.x_D[self.LK_idx] / self.x_D[self.HK_idx]
         ratio_B = self.x_B[self.LK_idx] / self.x_B[self.HK_idx]
         
-        N_min = np.log(ratio_D / ratio_B) / np.log(alpha_LK_HK)
+        N_min = math.log(ratio_D / ratio_B) / math.log(alpha_LK_HK)
         
         self.N_min = N_min
         self.alpha_avg = alpha_LK_HK
@@ -109,10 +117,13 @@ class ShortcutDistillation:
         alpha_HK = alpha[self.HK_idx]
         alpha_LK = alpha[self.LK_idx]
         
+        # Marge proportionnelle : reste valable pour les mélanges à volatilités proches
+        eps = max(1e-9, 1e-6 * (alpha_LK - alpha_HK))
         try:
-            theta = brentq(equation1, alpha_HK + 0.01, alpha_LK - 0.01)
-        except:
+            theta = toms748(equation1, alpha_HK + eps, alpha_LK - eps, xtol=1e-10)
+        except (ValueError, RuntimeError):
             theta = (alpha_HK + alpha_LK) / 2
+            logger.warning(f"⚠️ Underwood: racine non encadrée, θ = {theta:.3f} (milieu)")
         
         R_min_plus_1 = np.sum(alpha * self.x_D / (alpha - theta))
         R_min = max(R_min_plus_1 - 1, 0.5)
@@ -123,7 +134,8 @@ class ShortcutDistillation:
         return R_min, theta
     
     def gilliland_correlation(self, R):
-        """Calcule le nombre de plateaux (Gilliland)"""
+        """Calcule le nombre de plateaux (Gilliland), R scalaire ou tableau"""
+        R = np.asarray(R, dtype=np.float64)
         X = (R - self.R_min) / (R + 1)
         exponent = (1 + 54.4*X) * (X - 1) / ((11 + 117.2*X) * np.sqrt(X + 1e-10))
         Y = 1 - np.exp(exponent)
@@ -136,14 +148,14 @@ class ShortcutDistillation:
                     (self.z_F[self.HK_idx] / self.z_F[self.LK_idx]) * \
                     (self.x_B[self.LK_idx] / self.x_D[self.HK_idx])**2
         
-        log_ratio = 0.206 * np.log(ratio_term + 1e-10)
-        N_R_over_N_S = np.exp(log_ratio)
+        log_ratio = 0.206 * math.log(ratio_term + 1e-10)
+        N_R_over_N_S = math.exp(log_ratio)
         
         N_S = N_total / (1 + N_R_over_N_S)
         N_R = N_total - N_S
-        feed_stage = int(np.ceil(N_R)) + 1
+        feed_stage = math.ceil(N_R) + 1
         
-        return int(np.ceil(N_R)), int(np.floor(N_S)), feed_stage
+        return math.ceil(N_R), math.floor(N_S), feed_stage
     
     def complete_shortcut_design(self, recovery_LK_D=0.95, recovery_HK_B=0.95,
                                  R_factor=1.3, q=1.0, efficiency=0.70):
@@ -163,7 +175,7 @@ class ShortcutDistillation:
         N_theoretical = self.gilliland_correlation(R)
         
         # 5. Plateaux réels
-        N_real = int(np.ceil(N_theoretical / efficiency))
+        N_real = math.ceil(N_theoretical / efficiency)
         
         # 6. Kirkbride
         N_R, N_S, feed_stage = self.kirkbride_equation(N_real)
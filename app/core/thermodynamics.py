@@ -1,8 +1,9 @@
 ﻿"""
 Module Thermodynamics - Calculs thermodynamiques
 """
+import math
 import numpy as np
-from scipy.optimize import fsolve
+from scipy.optimize import toms748
 
 
 class ThermodynamicPackage:
@@ -12,6 +13,14 @@ class ThermodynamicPackage:
         self.compounds = compounds
         self.n_comp = len(compounds)
         self.compound_names = [c.name for c in compounds]
+        self._A, self._B, self._C = np.array([c.antoine for c in compounds]).T
+        
+        # Propriétés des composés en tableaux contigus (SoA) pour les calculs vectorisés
+        self._Tb = np.fromiter((c.Tb for c in compounds), float, self.n_comp)
+        self._Tc = np.fromiter((c.Tc for c in compounds), float, self.n_comp)
+        self._Pc = np.fromiter((c.Pc for c in compounds), float, self.n_comp)
+        self._omega = np.fromiter((c.omega for c in compounds), float, self.n_comp)
+        self._MW = np.fromiter((c.MW for c in compounds), float, self.n_comp)
         
     def K_values(self, T, P, x=None):
         """Calcule tous les coefficients K à T et P"""
@@ -25,45 +34,131 @@ class ThermodynamicPackage:
         alpha = K / K_ref
         return alpha
     
+    def _saturation_bracket(self, P):
+        """Encadrement [min, max] des températures de saturation des composés à P"""
+        T_sat = [comp.saturation_temperature(P) for comp in self.compounds]
+        return min(T_sat) - 1.0, max(T_sat) + 1.0  # marge pour les corps purs
+    
     def bubble_temperature(self, P, x, T_guess=None, tol=1e-6, max_iter=100):
         """Calcule la température de bulle"""
         x = np.array(x)
         
         if T_guess is None:
-            T_guess = np.sum([x[i] * self.compounds[i].Tb for i in range(self.n_comp)])
+            T_guess = x @ self._Tb
         
         def equation(T):
             K = self.K_values(T, P)
             return np.sum(K * x) - 1.0
         
         try:
-            T_bubble = fsolve(equation, T_guess, full_output=False)[0]
-            K = self.K_values(T_bubble, P)
-            y = K * x
-            y = y / np.sum(y)
-            return T_bubble, y
-        except:
+            T_bubble = toms748(equation, *self._saturation_bracket(P), xtol=tol, maxiter=max_iter)
+        except (ValueError, RuntimeError):
             return T_guess, x.copy()
+        
+        K = self.K_values(T_bubble, P)
+        y = K * x
+        y = y / np.sum(y)
+        return T_bubble, y
+    
+    def bubble_temperature_batch(self, P, X, T_guess=None, tol=1e-6, max_iter=50):
+        """Calcule les températures de bulle de plusieurs liquides (Newton vectorisé)
+        
+        X est un tableau (n_stages, n_comp) ; retourne (T, Y, converged).
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if T_guess is None:
+            T = X @ self._Tb
+        else:
+            T = np.broadcast_to(np.asarray(T_guess, dtype=np.float64), X.shape[:1]).copy()
+        A_lnP = self._A - math.log(P)
+        
+        # Tampons réutilisés à chaque itération (aucune allocation (n_stages, n_comp))
+        denom = np.empty_like(X)
+        K_buf = np.empty_like(X)
+        KX_buf = np.empty_like(X)
+        converged = np.zeros(X.shape[0], dtype=bool)
+        
+        for _ in range(max_iter):
+            # ln K = A - ln P - B/(T + C)
+            np.add(self._C, T[:, None], out=denom)
+            np.divide(self._B, denom, out=K_buf)
+            np.subtract(A_lnP, K_buf, out=K_buf)
+            np.exp(K_buf, out=K_buf)
+            np.multiply(K_buf, X, out=KX_buf)
+            S = KX_buf.sum(axis=1)
+            
+            # d(sum K·x)/dT = sum K·x·B/(T + C)²
+            np.square(denom, out=denom)
+            np.divide(KX_buf, denom, out=KX_buf)
+            np.multiply(KX_buf, self._B, out=KX_buf)
+            dS = KX_buf.sum(axis=1)
+            
+            # Newton sur ln(sum K·x) = 0, quasi linéaire en T
+            dT = np.log(S) * S / dS
+            T -= dT
+            converged = np.abs(dT) < tol
+            if converged.all():
+                break
+        
+        # Repli en bloc par bissection pour les lignes où Newton a échoué
+        failed = ~converged
+        if failed.any():
+            T[failed], converged[failed] = self._bubble_bisection(A_lnP, X[failed], tol)
+        
+        np.add(self._C, T[:, None], out=denom)
+        np.divide(self._B, denom, out=K_buf)
+        np.subtract(A_lnP, K_buf, out=K_buf)
+        np.exp(K_buf, out=K_buf)
+        np.multiply(K_buf, X, out=KX_buf)
+        Y = KX_buf / KX_buf.sum(axis=1, keepdims=True)
+        return T, Y, converged
+    
+    def _bubble_bisection(self, A_lnP, X, tol=1e-6):
+        """Bissection vectorisée sur sum(K·x) = 1, encadrée par [min(T_sat), max(T_sat)]
+        
+        Retourne (T, converged) ; une ligne n'est convergée que si le résidu
+        |sum(K·x) - 1| < tol ou si la racine reste encadrée par un intervalle < tol.
+        """
+        T_sat = self._B / A_lnP - self._C
+        lo = np.full(X.shape[0], T_sat.min() - 1.0)
+        hi = np.full(X.shape[0], T_sat.max() + 1.0)
+        
+        n_iter = math.ceil(math.log2((hi[0] - lo[0]) / tol))
+        for _ in range(n_iter):
+            mid = 0.5 * (lo + hi)
+            S = (np.exp(A_lnP - self._B / (self._C + mid[:, None])) * X).sum(axis=1)
+            too_hot = S > 1.0
+            hi = np.where(too_hot, mid, hi)
+            lo = np.where(too_hot, lo, mid)
+        
+        def residual(T):
+            return (np.exp(A_lnP - self._B / (self._C + T[:, None])) * X).sum(axis=1) - 1.0
+        
+        T = 0.5 * (lo + hi)
+        bracketed = (residual(lo) <= 0.0) & (residual(hi) >= 0.0)
+        converged = (np.abs(residual(T)) < tol) | (bracketed & (hi - lo < tol))
+        return T, converged
     
     def dew_temperature(self, P, y, T_guess=None):
         """Calcule la température de rosée"""
         y = np.array(y)
         
         if T_guess is None:
-            T_guess = np.sum([y[i] * self.compounds[i].Tb for i in range(self.n_comp)])
+            T_guess = y @ self._Tb
         
         def equation(T):
             K = self.K_values(T, P)
             return np.sum(y / K) - 1.0
         
         try:
-            T_dew = fsolve(equation, T_guess, full_output=False)[0]
-            K = self.K_values(T_dew, P)
-            x = y / K
-            x = x / np.sum(x)
-            return T_dew, x
-        except:
+            T_dew = toms748(equation, *self._saturation_bracket(P))
+        except (ValueError, RuntimeError):
             return T_guess, y.copy()
+        
+        K = self.K_values(T_dew, P)
+        x = y / K
+        x = x / np.sum(x)
+        return T_dew, x
     
     def mixture_enthalpy_liquid(self, T, x, T_ref=298.15):
         """Calcule l'enthalpie du mélange liquide"""
@@ -75,4 +170,19 @@ class ThermodynamicPackage:
         """Calcule l'enthalpie du mélange vapeur"""
         H_V = np.sum([y[i] * self.compounds[i].enthalpy_vapor(T, T_ref) 
                      for i in range(self.n_comp)])
-        return H_V
\ No newline at end of file
+        return H_V
+    
+    def mixture_enthalpies(self, Ts, Xs, T_ref=298.15):
+        """Enthalpies (H_V, H_L) de plusieurs mélanges (Ts[k], Xs[k]) en un appel"""
+        Ts = np.atleast_1d(np.asarray(Ts, dtype=np.float64))
+        Xs = np.atleast_2d(np.asarray(Xs, dtype=np.float64))
+        
+        # terms[k, i] = (H_L, Hvap) du composé i à Ts[k]
+        terms = np.array([[comp._enthalpy_terms(T, T_ref)
+                           for comp in self.compounds] for T in Ts])
+        H_L_pure = terms[..., 0]
+        H_V_pure = H_L_pure + terms[..., 1]
+        
+        H_V = np.einsum('ij,ij->i', Xs, H_V_pure)
+        H_L = np.einsum('ij,ij->i', Xs, H_L_pure)
+        return H_V, H_L
\ No newline at end of file
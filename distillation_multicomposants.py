@@ -8,31 +8,24 @@ Cours: Modélisation et Simulation des Procédés - PIC
 Université uh1
 """
 
+import math
+import threading
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import fsolve, brentq, minimize
+from scipy.optimize import minimize, toms748
 from scipy.linalg import solve_banded
 from thermo.chemical import Chemical
 from thermo import ChemicalConstantsPackage, PRMIX, CEOSLiquid, CEOSGas
 import warnings
 warnings.filterwarnings('ignore')
 
-# Pour visualisations interactives
-try:
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-    import plotly.express as px
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-    print("⚠ Plotly non disponible. Installation: pip install plotly")
-    print("  Les visualisations interactives ne seront pas disponibles.")
-
 class Compound:
     """
     Représente un composé chimique avec ses propriétés thermodynamiques
     """
     
+    # Nombre maximal de termes d'enthalpie conservés par composé
+    _ENTHALPY_CACHE_SIZE = 1024
+    
     def __init__(self, name):
         """
         Initialise le composé depuis la base de données thermo
@@ -58,9 +51,69 @@ class Compound:
             # Pour l'enthalpie
             self.Hfus = self.chem.Hfusm if self.chem.Hfusm else 0  # Enthalpie de fusion
             
+            # ln(Psat) tabulé une fois sur le domaine de validité de la corrélation
+            # puis interpolé : l'interpolation en espace logarithmique est quasi
+            # exacte pour une courbe de type Antoine
+            self._T_grid, self._lnPsat_grid = self._tabulate_psat()
+            
+            # Coefficients d'Antoine pour les calculs vectorisés
+            self.antoine = self._fit_antoine()
+            
+            # Termes d'enthalpie par (T arrondie, T_ref), voir _enthalpy_terms
+            self._enthalpy_cache = {}
+            self._enthalpy_lock = threading.Lock()
+            
         except Exception as e:
             raise ValueError(f"Impossible de charger le composé '{name}': {e}")
     
+    def _tabulate_psat(self, n_points=1001):
+        """
+        Tabule ln(Psat) sur le domaine de validité de la corrélation de thermo
+        (de sa borne basse jusqu'à Tc), points sans valeur exclus
+        
+        Returns:
+        --------
+        T_grid : ndarray
+            Températures (K), croissantes
+        lnPsat_grid : ndarray
+            ln(Psat) correspondants (Psat en Pa)
+        """
+        vp = self.chem.VaporPressure
+        T_min, T_max = vp.T_limits.get(vp.method, (0.5 * self.Tb, 1.5 * self.Tb))
+        if self.Tc:
+            T_max = min(T_max, self.Tc)
+        T = np.linspace(T_min, T_max, n_points)
+        P = np.array([vp.T_dependent_property(t) or np.nan for t in T], dtype=float)
+        valid = np.isfinite(P) & (P > 0)
+        if valid.sum() < 2:
+            raise ValueError("pression de vapeur indisponible")
+        return T[valid], np.log(P[valid])
+    
+    def _fit_antoine(self, n_points=25):
+        """
+        Ajuste l'équation d'Antoine ln(Psat) = A - B/(T + C) sur la
+        pression de vapeur de thermo (Psat en Pa, T en K), uniquement
+        sur le domaine tabulé
+        
+        Returns:
+        --------
+        A, B, C : float
+            Coefficients d'Antoine
+        """
+        T_lo = max(0.7 * self.Tb, self._T_grid[0])
+        T_hi = min(1.3 * self.Tb, self._T_grid[-1])
+        if self.Tc:
+            T_hi = min(T_hi, 0.95 * self.Tc)
+        if T_hi <= T_lo:
+            T_lo, T_hi = self._T_grid[0], self._T_grid[-1]
+        T = np.linspace(T_lo, T_hi, n_points)
+        lnP = np.interp(T, self._T_grid, self._lnPsat_grid)
+        
+        # ln(P)·T = A·T + (A·C - B) - C·ln(P) : linéaire en (A, A·C - B, C)
+        M = np.column_stack([T, np.ones_like(T), -lnP])
+        (A, AC_minus_B, C), *_ = np.linalg.lstsq(M, lnP * T, rcond=None)
+        return A, A * C - AC_minus_B, C
+    
     def vapor_pressure(self, T):
         """
         Calcule la pression de vapeur saturante à la température T
@@ -73,11 +126,45 @@ class Compound:
         Returns:
         --------
         Psat : float
-            Pression de vapeur saturante (Pa)
+            Pression de vapeur saturante (Pa), bornée à Pc au-delà du
+            point critique (excursions des solveurs itératifs)
+        """
+        if self.Tc and T >= self.Tc:
+            return self.Pc  # K = Pc/P : limite au point critique
+        if self._T_grid[0] <= T <= self._T_grid[-1]:
+            return math.exp(np.interp(T, self._T_grid, self._lnPsat_grid))
+        # Hors grille : corrélation de thermo directement (pas de valeur bornée)
+        # (T_dependent_property n'écrit pas le cache de thermo, partagé entre threads)
+        Psat = self.chem.VaporPressure.T_dependent_property(T)
+        if Psat:
+            return Psat
+        A, B, C = self.antoine
+        return math.exp(A - B / (T + C))
+    
+    def saturation_temperature(self, P):
+        """
+        Calcule la température de saturation à la pression P
+        (inverse de vapor_pressure sur la grille tabulée)
+        
+        Parameters:
+        -----------
+        P : float
+            Pression (Pa)
+        
+        Returns:
+        --------
+        T_sat : float
+            Température de saturation (K)
         """
-        self.chem.T = T
-        Psat = self.chem.Psat
-        return Psat if Psat else 1e-10  # Éviter division par zéro
+        lnP = math.log(P)
+        if self._lnPsat_grid[0] <= lnP <= self._lnPsat_grid[-1]:
+            return float(np.interp(lnP, self._lnPsat_grid, self._T_grid))
+        # Hors grille : inversion de la corrélation, Antoine en dernier recours
+        try:
+            return self.chem.VaporPressure.solve_property(P)
+        except Exception:
+            A, B, C = self.antoine
+            return B / (A - lnP) - C
     
     def K_value(self, T, P):
         """
@@ -116,10 +203,10 @@ class Compound:
         H_L : float
             Enthalpie molaire liquide (J/mol)
         """
-        self.chem.T = T
         try:
             # Utiliser la capacité calorifique pour l'intégration
-            Cp_liquid = self.chem.Cplm  # J/(mol·K)
+            # (évaluée à T sans modifier l'état de self.chem)
+            Cp_liquid = self.chem.HeatCapacityLiquid.T_dependent_property(T)  # J/(mol·K)
             H_L = Cp_liquid * (T - T_ref)
             return H_L
         except:
@@ -142,11 +229,38 @@ class Compound:
         H_V : float
             Enthalpie molaire vapeur (J/mol)
         """
-        H_L = self.enthalpy_liquid(T, T_ref)
-        self.chem.T = T
-        Hvap = self.chem.Hvap if self.chem.Hvap else 40000  # J/mol (valeur typique)
+        H_L, Hvap = self._enthalpy_terms(T, T_ref)
         return H_L + Hvap
     
+    def _enthalpy_terms(self, T, T_ref=298.15):
+        """
+        Calcule en une fois l'enthalpie liquide et l'enthalpie de vaporisation
+        à T arrondie à 0.01 K (mise en cache par instance sur (T, T_ref))
+        
+        Returns:
+        --------
+        H_L : float
+            Enthalpie molaire liquide (J/mol)
+        Hvap : float
+            Enthalpie molaire de vaporisation (J/mol)
+        """
+        T = round(float(T), 2)
+        key = (T, T_ref)
+        terms = self._enthalpy_cache.get(key)
+        if terms is None:
+            H_L = self.enthalpy_liquid(T, T_ref)
+            # Même grandeur que Chemical.Hvap à T, calculée sans modifier self.chem
+            # (objet partagé entre threads)
+            Hvapm = self.chem.EnthalpyVaporization.T_dependent_property(T)
+            Hvap = Hvapm * 1000.0 / self.MW if Hvapm else 40000  # valeur typique
+            terms = (H_L, Hvap)
+            # Cache borné, partagé entre threads : modifications sous verrou
+            with self._enthalpy_lock:
+                if len(self._enthalpy_cache) >= self._ENTHALPY_CACHE_SIZE:
+                    self._enthalpy_cache.clear()
+                self._enthalpy_cache[key] = terms
+        return terms
+    
     def __repr__(self):
         return f"Compound(name='{self.name}', Tb={self.Tb-273.15:.1f}°C, MW={self.MW:.2f})"
 
@@ -167,6 +281,17 @@ class ThermodynamicPackage:
         self.n_comp = len(compounds)
         self.compound_names = [c.name for c in compounds]
         
+        # Coefficients d'Antoine sous forme de tableaux (calculs vectorisés)
+        self._A, self._B, self._C = np.array([c.antoine for c in compounds]).T
+        
+        # Propriétés des composés en tableaux contigus (SoA) : les règles de
+        # mélange ou une future EOS (PRMIX) s'écrivent en une expression vectorisée
+        self._Tb = np.fromiter((c.Tb for c in compounds), float, self.n_comp)
+        self._Tc = np.fromiter((c.Tc for c in compounds), float, self.n_comp)
+        self._Pc = np.fromiter((c.Pc for c in compounds), float, self.n_comp)
+        self._omega = np.fromiter((c.omega for c in compounds), float, self.n_comp)
+        self._MW = np.fromiter((c.MW for c in compounds), float, self.n_comp)
+        
     def K_values(self, T, P, x=None):
         """
         Calcule tous les coefficients K à T et P
@@ -211,6 +336,21 @@ class ThermodynamicPackage:
         alpha = K / K_ref
         return alpha
     
+    def _saturation_bracket(self, P):
+        """
+        Encadre les températures de bulle et de rosée à P
+        
+        Pour un mélange idéal, elles sont comprises entre les températures
+        de saturation du composé le plus volatil et du moins volatil.
+        
+        Returns:
+        --------
+        T_min, T_max : float
+            Bornes de l'intervalle (K)
+        """
+        T_sat = [comp.saturation_temperature(P) for comp in self.compounds]
+        return min(T_sat) - 1.0, max(T_sat) + 1.0  # marge pour les corps purs
+    
     def bubble_temperature(self, P, x, T_guess=None, tol=1e-6, max_iter=100):
         """
         Calcule la température de bulle pour une composition liquide donnée
@@ -237,21 +377,139 @@ class ThermodynamicPackage:
         
         if T_guess is None:
             # Estimation: moyenne pondérée des Tb
-            T_guess = np.sum([x[i] * self.compounds[i].Tb for i in range(self.n_comp)])
+            T_guess = x @ self._Tb
         
         def equation(T):
             K = self.K_values(T, P)
             return np.sum(K * x) - 1.0
         
+        # La racine est encadrée par les températures de saturation des purs
         try:
-            T_bubble = fsolve(equation, T_guess, full_output=False)[0]
-            K = self.K_values(T_bubble, P)
-            y = K * x
-            y = y / np.sum(y)  # Normalisation
-            return T_bubble, y
-        except:
+            T_bubble = toms748(equation, *self._saturation_bracket(P), xtol=tol, maxiter=max_iter)
+        except (ValueError, RuntimeError):
             print(f"⚠ Convergence difficile pour bubble T avec x={x}")
             return T_guess, x.copy()
+        
+        K = self.K_values(T_bubble, P)
+        y = K * x
+        y = y / np.sum(y)  # Normalisation
+        return T_bubble, y
+    
+    def bubble_temperature_batch(self, P, X, T_guess=None, tol=1e-6, max_iter=50):
+        """
+        Calcule les températures de bulle de plusieurs compositions liquides
+        en une seule résolution de Newton vectorisée (modèle d'Antoine)
+        
+        Parameters:
+        -----------
+        P : float
+            Pression (Pa)
+        X : array (n_stages, n_comp)
+            Compositions liquides (une ligne par plateau)
+        T_guess : array, optional
+            Estimations initiales (K), par défaut moyenne pondérée des Tb
+        
+        Returns:
+        --------
+        T : ndarray (n_stages,)
+            Températures de bulle (K)
+        Y : ndarray (n_stages, n_comp)
+            Compositions vapeur à l'équilibre
+        converged : ndarray of bool (n_stages,)
+            Convergence de chaque ligne
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if T_guess is None:
+            T = X @ self._Tb
+        else:
+            T = np.broadcast_to(np.asarray(T_guess, dtype=np.float64), X.shape[:1]).copy()
+        A_lnP = self._A - math.log(P)
+        
+        # Tampons réutilisés à chaque itération (aucune allocation (n_stages, n_comp))
+        denom = np.empty_like(X)
+        K_buf = np.empty_like(X)
+        KX_buf = np.empty_like(X)
+        converged = np.zeros(X.shape[0], dtype=bool)
+        
+        for _ in range(max_iter):
+            # ln K = A - ln P - B/(T + C)
+            np.add(self._C, T[:, None], out=denom)
+            np.divide(self._B, denom, out=K_buf)
+            np.subtract(A_lnP, K_buf, out=K_buf)
+            np.exp(K_buf, out=K_buf)
+            np.multiply(K_buf, X, out=KX_buf)
+            S = KX_buf.sum(axis=1)
+            
+            # d(sum K·x)/dT = sum K·x·B/(T + C)²
+            np.square(denom, out=denom)
+            np.divide(KX_buf, denom, out=KX_buf)
+            np.multiply(KX_buf, self._B, out=KX_buf)
+            dS = KX_buf.sum(axis=1)
+            
+            # Newton sur ln(sum K·x) = 0, quasi linéaire en T
+            dT = np.log(S) * S / dS
+            T -= dT
+            converged = np.abs(dT) < tol
+            if converged.all():
+                break
+        
+        # Repli en bloc par bissection pour les lignes où Newton a échoué
+        failed = ~converged
+        if failed.any():
+            T[failed], converged[failed] = self._bubble_bisection(A_lnP, X[failed], tol)
+        
+        np.add(self._C, T[:, None], out=denom)
+        np.divide(self._B, denom, out=K_buf)
+        np.subtract(A_lnP, K_buf, out=K_buf)
+        np.exp(K_buf, out=K_buf)
+        np.multiply(K_buf, X, out=KX_buf)
+        Y = KX_buf / KX_buf.sum(axis=1, keepdims=True)
+        return T, Y, converged
+    
+    def _bubble_bisection(self, A_lnP, X, tol=1e-6):
+        """
+        Bissection vectorisée sur sum(K_i·x_i) = 1 (modèle d'Antoine)
+        
+        L'intervalle [min(T_sat), max(T_sat)] à la pression P encadre toujours
+        la température de bulle d'un mélange idéal. Une ligne n'est déclarée
+        convergée que si |sum(K·x) - 1| < tol ou si la racine reste encadrée
+        par un intervalle de largeur < tol.
+        
+        Parameters:
+        -----------
+        A_lnP : array (n_comp,)
+            Coefficients A d'Antoine moins ln(P)
+        X : array (n_rows, n_comp)
+            Compositions liquides
+        tol : float
+            Largeur finale de l'intervalle (K)
+        
+        Returns:
+        --------
+        T : ndarray (n_rows,)
+            Températures de bulle (K)
+        converged : ndarray (n_rows,) of bool
+            Masque de convergence
+        """
+        T_sat = self._B / A_lnP - self._C
+        lo = np.full(X.shape[0], T_sat.min() - 1.0)
+        hi = np.full(X.shape[0], T_sat.max() + 1.0)
+        
+        n_iter = math.ceil(math.log2((hi[0] - lo[0]) / tol))
+        for _ in range(n_iter):
+            mid = 0.5 * (lo + hi)
+            S = (np.exp(A_lnP - self._B / (self._C + mid[:, None])) * X).sum(axis=1)
+            too_hot = S > 1.0
+            hi = np.where(too_hot, mid, hi)
+            lo = np.where(too_hot, lo, mid)
+        
+        def residual(T):
+            return (np.exp(A_lnP - self._B / (self._C + T[:, None])) * X).sum(axis=1) - 1.0
+        
+        T = 0.5 * (lo + hi)
+        bracketed = (residual(lo) <= 0.0) & (residual(hi) >= 0.0)
+        converged = (np.abs(residual(T)) < tol) | (bracketed & (hi - lo < tol))
+        return T, converged
     
     def dew_temperature(self, P, y, T_guess=None, tol=1e-6, max_iter=100):
         """
@@ -279,21 +537,22 @@ class ThermodynamicPackage:
         
         if T_guess is None:
             # Estimation: moyenne pondérée des Tb
-            T_guess = np.sum([y[i] * self.compounds[i].Tb for i in range(self.n_comp)])
+            T_guess = y @ self._Tb
         
         def equation(T):
             K = self.K_values(T, P)
             return np.sum(y / K) - 1.0
         
         try:
-            T_dew = fsolve(equation, T_guess, full_output=False)[0]
-            K = self.K_values(T_dew, P)
-            x = y / K
-            x = x / np.sum(x)  # Normalisation
-            return T_dew, x
-        except:
+            T_dew = toms748(equation, *self._saturation_bracket(P), xtol=tol, maxiter=max_iter)
+        except (ValueError, RuntimeError):
             print(f"⚠ Convergence difficile pour dew T avec y={y}")
             return T_guess, y.copy()
+        
+        K = self.K_values(T_dew, P)
+        x = y / K
+        x = x / np.sum(x)  # Normalisation
+        return T_dew, x
     
     def mixture_enthalpy_liquid(self, T, x, T_ref=298.15):
         """
@@ -341,6 +600,41 @@ class ThermodynamicPackage:
                      for i in range(self.n_comp)])
         return H_V
     
+    def mixture_enthalpies(self, Ts, Xs, T_ref=298.15):
+        """
+        Calcule les enthalpies vapeur et liquide de plusieurs mélanges
+        en un seul appel (chaque propriété de corps pur n'est évaluée
+        qu'une fois par température)
+        
+        Parameters:
+        -----------
+        Ts : array (n_points,)
+            Températures (K)
+        Xs : array (n_points, n_comp)
+            Compositions molaires (une ligne par température)
+        T_ref : float
+            Température de référence (K)
+        
+        Returns:
+        --------
+        H_V : ndarray (n_points,)
+            Enthalpies molaires des mélanges vapeur (J/mol)
+        H_L : ndarray (n_points,)
+            Enthalpies molaires des mélanges liquides (J/mol)
+        """
+        Ts = np.atleast_1d(np.asarray(Ts, dtype=np.float64))
+        Xs = np.atleast_2d(np.asarray(Xs, dtype=np.float64))
+        
+        # terms[k, i] = (H_L, Hvap) du composé i à Ts[k]
+        terms = np.array([[comp._enthalpy_terms(T, T_ref)
+                           for comp in self.compounds] for T in Ts])
+        H_L_pure = terms[..., 0]
+        H_V_pure = H_L_pure + terms[..., 1]
+        
+        H_V = np.einsum('ij,ij->i', Xs, H_V_pure)
+        H_L = np.einsum('ij,ij->i', Xs, H_L_pure)
+        return H_V, H_L
+    
     def print_properties(self, T, P):
         """
         Affiche les propriétés à T et P
@@ -394,22 +688,13 @@ class ShortcutDistillation:
         T_avg = np.mean([comp.Tb for comp in self.thermo.compounds])
         alpha = self.thermo.relative_volatilities(T_avg, self.P)
         
-        # Trier par volatilité décroissante
-        sorted_indices = np.argsort(alpha)[::-1]
-        
         # Clé léger: composé le plus volatil avec z_F significatif
         # Clé lourd: composé le moins volatil avec z_F significatif
         threshold = 0.01  # Seuil de composition significative
+        mask = self.z_F > threshold
         
-        for idx in sorted_indices:
-            if self.z_F[idx] > threshold:
-                self.LK_idx = idx  # Light Key
-                break
-        
-        for idx in sorted_indices[::-1]:
-            if self.z_F[idx] > threshold:
-                self.HK_idx = idx  # Heavy Key
-                break
+        self.LK_idx = int(np.argmax(np.where(mask, alpha, -np.inf)))  # Light Key
+        self.HK_idx = int(np.argmin(np.where(mask, alpha, np.inf)))   # Heavy Key
         
         print(f"\n✓ Composés clés identifiés:")
         print(f"  Clé léger (LK): {self.thermo.compound_names[self.LK_idx]}")
@@ -417,7 +702,8 @@ class ShortcutDistillation:
     
     def material_balance(self, recovery_LK_D=0.95, recovery_HK_B=0.95):
         """
-        Calcule les bilans matières globaux
+        Calcule les bilans matières globaux et les conserve pour les
+        méthodes suivantes (Fenske, Underwood, Kirkbride)
         
         Parameters:
         -----------
@@ -432,11 +718,52 @@ class ShortcutDistillation:
             Débit de distillat (kmol/h)
         B : float
             Débit de résidu (kmol/h)
-        x_D : array
+        x_D : array (n_comp,)
             Composition du distillat
-        x_B : array
+        x_B : array (n_comp,)
             Composition du résidu
         """
+        if np.ndim(recovery_LK_D) or np.ndim(recovery_HK_B):
+            raise ValueError("Récupérations scalaires attendues : "
+                             "utiliser material_balance_sweep pour des tableaux")
+        D, B, x_D, x_B = self.material_balance_sweep(recovery_LK_D, recovery_HK_B)
+        
+        self.D = D
+        self.B = B
+        self.x_D = x_D
+        self.x_B = x_B
+        
+        return D, B, x_D, x_B
+    
+    def material_balance_sweep(self, recovery_LK_D, recovery_HK_B):
+        """
+        Bilans matières sans modifier l'état de l'instance
+        
+        Parameters:
+        -----------
+        recovery_LK_D : float or array
+            Récupération du clé léger dans le distillat (fraction)
+        recovery_HK_B : float or array
+            Récupération du clé lourd dans le résidu (fraction)
+        
+        Les récupérations sont diffusées (broadcast) : avec des tableaux,
+        une étude de sensibilité complète tient en un seul appel.
+        
+        Returns:
+        --------
+        D : float or array
+            Débit de distillat (kmol/h)
+        B : float or array
+            Débit de résidu (kmol/h)
+        x_D : array (..., n_comp)
+            Composition du distillat
+        x_B : array (..., n_comp)
+            Composition du résidu
+        """
+        recovery_LK_D = np.asarray(recovery_LK_D, dtype=np.float64)
+        recovery_HK_B = np.asarray(recovery_HK_B, dtype=np.float64)
+        shape = np.broadcast_shapes(recovery_LK_D.shape, recovery_HK_B.shape) + (self.n_comp,)
+        
         # Débits des clés
         LK_in_feed = self.F * self.z_F[self.LK_idx]
         HK_in_feed = self.F * self.z_F[self.HK_idx]
@@ -448,45 +775,31 @@ class ShortcutDistillation:
         HK_in_B = recovery_HK_B * HK_in_feed
         HK_in_D = HK_in_feed - HK_in_B
         
-        # Initialisation des compositions
-        d = np.zeros(self.n_comp)  # Débits dans distillat
-        b = np.zeros(self.n_comp)  # Débits dans résidu
-        
-        d[self.LK_idx] = LK_in_D
-        d[self.HK_idx] = HK_in_D
-        b[self.LK_idx] = LK_in_B
-        b[self.HK_idx] = HK_in_B
-        
-        # Distribution des composés non-clés (approximation)
-        for i in range(self.n_comp):
-            if i != self.LK_idx and i != self.HK_idx:
-                T_avg = np.mean([comp.Tb for comp in self.thermo.compounds])
-                alpha = self.thermo.relative_volatilities(T_avg, self.P)
-                
-                if alpha[i] > alpha[self.LK_idx]:
-                    # Plus léger que LK: tout dans distillat
-                    d[i] = self.F * self.z_F[i]
-                    b[i] = 0
-                elif alpha[i] < alpha[self.HK_idx]:
-                    # Plus lourd que HK: tout dans résidu
-                    d[i] = 0
-                    b[i] = self.F * self.z_F[i]
-                else:
-                    # Entre LK et HK: répartition proportionnelle
-                    ratio = (alpha[i] - alpha[self.HK_idx]) / (alpha[self.LK_idx] - alpha[self.HK_idx])
-                    d[i] = ratio * self.F * self.z_F[i]
-                    b[i] = (1 - ratio) * self.F * self.z_F[i]
-        
-        D = np.sum(d)
-        B = np.sum(b)
-        
-        x_D = d / D
-        x_B = b / B
+        # Distribution des composés non-clés (approximation) :
+        # plus léger que LK -> distillat, plus lourd que HK -> résidu,
+        # entre les deux -> répartition proportionnelle à la volatilité
+        T_avg = np.mean([comp.Tb for comp in self.thermo.compounds])
+        alpha = self.thermo.relative_volatilities(T_avg, self.P)
+        alpha_LK = alpha[self.LK_idx]
+        alpha_HK = alpha[self.HK_idx]
+        frac_D = np.where(alpha > alpha_LK, 1.0,
+                          np.where(alpha < alpha_HK, 0.0,
+                                   (alpha - alpha_HK) / (alpha_LK - alpha_HK)))
         
-        self.D = D
-        self.B = B
-        self.x_D = x_D
-        self.x_B = x_B
+        f = self.F * self.z_F
+        d = np.broadcast_to(frac_D * f, shape).copy()        # Débits dans distillat
+        b = np.broadcast_to((1 - frac_D) * f, shape).copy()  # Débits dans résidu
+        
+        d[..., self.LK_idx] = LK_in_D
+        d[..., self.HK_idx] = HK_in_D
+        b[..., self.LK_idx] = LK_in_B
+        b[..., self.HK_idx] = HK_in_B
+        
+        D = d.sum(axis=-1)
+        B = b.sum(axis=-1)
+        
+        x_D = d / np.expand_dims(D, -1)
+        x_B = b / np.expand_dims(B, -1)
         
         return D, B, x_D, x_B
     
@@ -518,7 +831,7 @@ class ShortcutDistillation:
         ratio_B = self.x_B[self.LK_idx] / self.x_B[self.HK_idx]
         
         # Nombre minimum de plateaux
-        N_min = np.log(ratio_D / ratio_B) / np.log(alpha_LK_HK)
+        N_min = math.log(ratio_D / ratio_B) / math.log(alpha_LK_HK)
         
         self.N_min = N_min
         self.alpha_avg = alpha_LK_HK
@@ -553,10 +866,13 @@ class ShortcutDistillation:
         alpha_HK = alpha[self.HK_idx]
         alpha_LK = alpha[self.LK_idx]
         
+        # Marge proportionnelle à l'écart (une marge fixe de 0.01 échoue
+        # pour les mélanges à volatilités proches)
+        eps = max(1e-9, 1e-6 * (alpha_LK - alpha_HK))
         try:
-            theta = brentq(equation1, alpha_HK + 0.01, alpha_LK - 0.01)
-        except:
-            # Si brentq échoue, utiliser une valeur intermédiaire
+            theta = toms748(equation1, alpha_HK + eps, alpha_LK - eps, xtol=1e-10)
+        except (ValueError, RuntimeError):
+            # Racine non encadrée : utiliser une valeur intermédiaire
             theta = (alpha_HK + alpha_LK) / 2
             print(f"⚠ Convergence difficile pour theta, utilisation de {theta:.3f}")
         
@@ -575,14 +891,16 @@ class ShortcutDistillation:
         
         Parameters:
         -----------
-        R : float
-            Rapport de reflux opératoire
+        R : float or array
+            Rapport de reflux opératoire (un tableau donne la courbe N(R)
+            complète en un seul appel vectorisé)
         
         Returns:
         --------
-        N : float
+        N : float or array
             Nombre de plateaux théoriques
         """
+        R = np.asarray(R, dtype=np.float64)
         X = (R - self.R_min) / (R + 1)
         
         # Corrélation de Gilliland
@@ -617,16 +935,16 @@ class ShortcutDistillation:
                     (self.z_F[self.HK_idx] / self.z_F[self.LK_idx]) * \
                     (self.x_B[self.LK_idx] / self.x_D[self.HK_idx])**2
         
-        log_ratio = 0.206 * np.log(ratio_term + 1e-10)
-        N_R_over_N_S = np.exp(log_ratio)
+        log_ratio = 0.206 * math.log(ratio_term + 1e-10)
+        N_R_over_N_S = math.exp(log_ratio)
         
         # Résolution
         N_S = N_total / (1 + N_R_over_N_S)
         N_R = N_total - N_S
         
-        feed_stage = int(np.ceil(N_R)) + 1
+        feed_stage = math.ceil(N_R) + 1
         
-        return int(np.ceil(N_R)), int(np.floor(N_S)), feed_stage
+        return math.ceil(N_R), math.floor(N_S), feed_stage
     
     def complete_shortcut_design(self, recovery_LK_D=0.95, recovery_HK_B=0.95,
                                  R_factor=1.3, q=1.0, efficiency=0.70):
@@ -682,7 +1000,7 @@ class ShortcutDistillation:
         print(f"   N théorique = {N_theoretical:.2f} plateaux")
         
         # 5. Plateaux réels
-        N_real = int(np.ceil(N_theoretical / efficiency))
+        N_real = math.ceil(N_theoretical / efficiency)
         print(f"   Efficacité = {efficiency*100:.1f}%")
         print(f"   N réel = {N_real} plateaux")
         
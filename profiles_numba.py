@@ -0,0 +1,166 @@
+"""
+Profils de colonne compilés (Numba)
+====================================
+Construction des profils de composition et de température plateau par
+plateau, compilée en code natif et parallélisée sur les plateaux.
+
+Seuls des tableaux NumPy sont passés au noyau (pas d'objets Compound) :
+extraire les coefficients une fois avec `antoine_arrays`.
+
+Auteur: Prof. BAKHER Zine Elabidine
+Cours: Modélisation et Simulation des Procédés - PIC
+"""
+
+import math
+import numpy as np
+
+# Compilation JIT optionnelle : sans Numba, le noyau s'exécute en Python pur
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Remplace numba.njit par l'identité si Numba n'est pas installé"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+def antoine_arrays(compounds):
+    """
+    Extrait les tableaux (A, B, C, Tb) des composés pour le noyau compilé
+
+    Parameters:
+    -----------
+    compounds : list of Compound
+        Composés (avec coefficients d'Antoine ajustés)
+
+    Returns:
+    --------
+    A, B, C, Tb : ndarray (n_comp,)
+        Coefficients d'Antoine (ln P en Pa, T en K) et températures d'ébullition
+    """
+    A = np.array([c.antoine[0] for c in compounds], dtype=np.float64)
+    B = np.array([c.antoine[1] for c in compounds], dtype=np.float64)
+    C = np.array([c.antoine[2] for c in compounds], dtype=np.float64)
+    Tb = np.array([c.Tb for c in compounds], dtype=np.float64)
+    return A, B, C, Tb
+
+
+@njit(parallel=True, cache=True)
+def build_profiles(N_real, feed_stage, x_D, x_B, z_F, A, B, C, Tb, P,
+                   tol=1e-6, max_iter=50):
+    """
+    Profils de composition (interpolation linéaire) et températures de bulle
+
+    Rectification (plateaux 1..feed) : x_D → z_F ;
+    épuisement (plateaux feed+1..N_real) : z_F → x_B.
+    La température de bulle de chaque plateau est obtenue par Newton sur
+    ln(sum K_i·x_i) = 0 (modèle d'Antoine), avec repli par bissection sur
+    [min(T_sat), max(T_sat)] si Newton ne converge pas.
+
+    Parameters:
+    -----------
+    N_real : int
+        Nombre de plateaux
+    feed_stage : int
+        Plateau d'alimentation
+    x_D, x_B, z_F : array (n_comp,)
+        Compositions distillat, résidu et alimentation
+    A, B, C : array (n_comp,)
+        Coefficients d'Antoine (voir `antoine_arrays`)
+    Tb : array (n_comp,)
+        Températures d'ébullition (estimation initiale)
+    P : float
+        Pression (Pa)
+
+    Returns:
+    --------
+    x_profiles : ndarray (N_real, n_comp)
+        Compositions liquides
+    y_profiles : ndarray (N_real, n_comp)
+        Compositions vapeur à l'équilibre
+    temperatures : ndarray (N_real,)
+        Températures de bulle (K)
+    """
+    n_comp = z_F.shape[0]
+    lnP = math.log(P)
+    n_rect = min(feed_stage, N_real)
+    n_strip = max(N_real - feed_stage, 1)
+
+    # Intervalle de repli commun à tous les plateaux
+    T_lo = np.inf
+    T_hi = -np.inf
+    for i in range(n_comp):
+        T_sat = B[i] / (A[i] - lnP) - C[i]
+        T_lo = min(T_lo, T_sat - 1.0)
+        T_hi = max(T_hi, T_sat + 1.0)
+
+    x_profiles = np.empty((N_real, n_comp))
+    y_profiles = np.empty((N_real, n_comp))
+    temperatures = np.empty(N_real)
+
+    for j in prange(N_real):
+        # Composition liquide du plateau j
+        x = x_profiles[j]
+        if j < n_rect:
+            ratio = j / feed_stage
+            for i in range(n_comp):
+                x[i] = x_D[i] + ratio * (z_F[i] - x_D[i])
+        else:
+            ratio = (j - n_rect + 1) / n_strip
+            for i in range(n_comp):
+                x[i] = z_F[i] + ratio * (x_B[i] - z_F[i])
+
+        s = 0.0
+        T = 0.0
+        for i in range(n_comp):
+            s += x[i]
+        for i in range(n_comp):
+            x[i] /= s
+            T += x[i] * Tb[i]
+
+        # Newton sur ln(sum K·x) = 0
+        converged = False
+        for _ in range(max_iter):
+            S = 0.0
+            dS = 0.0
+            for i in range(n_comp):
+                d = T + C[i]
+                Kx = math.exp(A[i] - lnP - B[i] / d) * x[i]
+                S += Kx
+                dS += Kx * B[i] / (d * d)
+            dT = math.log(S) * S / dS
+            T -= dT
+            if abs(dT) < tol:
+                converged = True
+                break
+
+        # Repli par bissection
+        if not converged or not math.isfinite(T):
+            lo = T_lo
+            hi = T_hi
+            while hi - lo > tol:
+                T = 0.5 * (lo + hi)
+                S = 0.0
+                for i in range(n_comp):
+                    S += math.exp(A[i] - lnP - B[i] / (T + C[i])) * x[i]
+                if S > 1.0:
+                    hi = T
+                else:
+                    lo = T
+            T = 0.5 * (lo + hi)
+
+        # Composition vapeur à l'équilibre
+        S = 0.0
+        for i in range(n_comp):
+            y_profiles[j, i] = math.exp(A[i] - lnP - B[i] / (T + C[i])) * x[i]
+            S += y_profiles[j, i]
+        for i in range(n_comp):
+            y_profiles[j, i] /= S
+        temperatures[j] = T
+
+    return x_profiles, y_profiles, temperatures
@@ -4,9 +4,17 @@ Point d'entrée avec support des templates HTML et PDF
 """
 import os
 import json
-from flask import Flask, jsonify, request, render_template, send_file
+import hashlib
+import random
+import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
+from flask import Flask, Response, request, render_template, send_file
 from flask_cors import CORS
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 from pathlib import Path
 
@@ -16,29 +24,277 @@ logging.basicConfig(
 )
 logger = logging.getLogger('distillation_app')
 
-# Importer les modules
-try:
-    from app.core.compound import Compound
-    from app.core.thermodynamics import ThermodynamicPackage
-    from app.core.shortcut_methods import ShortcutDistillation
-    MODULES_AVAILABLE = True
-    logger.info("✅ Modules importés avec succès")
-except ImportError as e:
-    logger.warning(f"⚠️ Modules non trouvés: {e}")
-    MODULES_AVAILABLE = False
-
-# Importer le générateur PDF
+# Backend matplotlib sans affichage, fixé avant tout import (pas de sonde Tk)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+# Modules lourds (thermo/scipy, reportlab) importés à la première utilisation :
+# un worker qui ne sert que /health ne les charge jamais.
+# Les indicateurs *_AVAILABLE valent None tant que l'import n'a pas été tenté.
+Compound = ThermodynamicPackage = ShortcutDistillation = None
+ReportGenerator = None
+MODULES_AVAILABLE = None
+PDF_AVAILABLE = None
+_IMPORT_LOCK = threading.Lock()
+
+
+def _load_modules():
+    """Importe les modules de calcul au premier appel ; retourne MODULES_AVAILABLE"""
+    global Compound, ThermodynamicPackage, ShortcutDistillation, MODULES_AVAILABLE
+    if MODULES_AVAILABLE is None:
+        with _IMPORT_LOCK:
+            if MODULES_AVAILABLE is None:
+                try:
+                    from app.core.compound import Compound
+                    from app.core.thermodynamics import ThermodynamicPackage
+                    from app.core.shortcut_methods import ShortcutDistillation
+                    MODULES_AVAILABLE = True
+                    logger.info("✅ Modules importés avec succès")
+                except ImportError as e:
+                    logger.warning(f"⚠️ Modules non trouvés: {e}")
+                    MODULES_AVAILABLE = False
+    return MODULES_AVAILABLE
+
+
+def _load_pdf():
+    """Importe le générateur PDF au premier appel ; retourne PDF_AVAILABLE"""
+    global ReportGenerator, PDF_AVAILABLE
+    if PDF_AVAILABLE is None:
+        with _IMPORT_LOCK:
+            if PDF_AVAILABLE is None:
+                try:
+                    from app.pdf_generation.report_generator import ReportGenerator
+                    PDF_AVAILABLE = True
+                    logger.info("✅ Générateur PDF disponible")
+                except ImportError as e:
+                    logger.warning(f"⚠️ Générateur PDF non disponible: {e}")
+                    PDF_AVAILABLE = False
+    return PDF_AVAILABLE
+
+
+@lru_cache(maxsize=256)
+def _get_compound(name):
+    """Compound partagé par nom (une seule requête à la base thermo par composé)"""
+    return Compound(name)
+
+
+# Packages thermodynamiques partagés, indexés par la liste ordonnée des composés.
+# La clé n'est pas triée : l'ordre des composés fixe celui de feed_composition
+# et des résultats (x_D, x_B).
+# Hypothèse de partage entre threads : ThermodynamicPackage et Compound ne
+# stockent aucun état mutable par appel (tout passe par les paramètres des
+# méthodes) ; ne pas y ajouter d'attributs modifiés pendant un calcul.
+# Seul le cache d'enthalpie de Compound est écrit en cours de calcul, sous
+# verrou ; les propriétés de thermo sont évaluées par T_dependent_property
+# (l'appel direct écrit le cache interne de l'objet Chemical partagé).
+_THERMO_CACHE: 'OrderedDict[tuple[str, ...], ThermodynamicPackage]' = OrderedDict()
+_THERMO_CACHE_MAX_SIZE = 64
+_THERMO_LOCK = threading.Lock()
+
+
+def get_thermo_package(names):
+    """Retourne le ThermodynamicPackage du système (LRU borné, créé au premier appel)"""
+    key = tuple(names)
+    with _THERMO_LOCK:
+        thermo = _THERMO_CACHE.get(key)
+        if thermo is None:
+            thermo = ThermodynamicPackage([_get_compound(name) for name in key])
+            _THERMO_CACHE[key] = thermo
+            if len(_THERMO_CACHE) > _THERMO_CACHE_MAX_SIZE:
+                _THERMO_CACHE.popitem(last=False)
+        else:
+            _THERMO_CACHE.move_to_end(key)
+    return thermo
+
+
+# Composés proposés par /api/compounds
+COMMON_COMPOUNDS = [
+    'benzene', 'toluene', 'o-xylene',
+    'ethanol', 'methanol', 'acetone',
+    'propanol', 'butanol', 'p-xylene', 'm-xylene'
+]
+
+
+def _build_compounds_list():
+    """Charge une seule fois les propriétés des composés courants"""
+    compounds_data = []
+    for name in COMMON_COMPOUNDS:
+        try:
+            comp = _get_compound(name)
+            compounds_data.append({
+                'name': name,
+                'Tb': round(comp.Tb - 273.15, 2),
+                'Tc': round(comp.Tc - 273.15, 2) if comp.Tc else None,
+                'MW': round(comp.MW, 2)
+            })
+        except Exception as e:
+            logger.debug(f"Impossible de charger {name}: {e}")
+    return compounds_data
+
+
+# Réponse de /api/compounds (statut, corps JSON, ETag), calculée au premier appel
+_COMPOUNDS_RESPONSE = None
+
+# Sérialisation JSON rapide (orjson optionnel, json standard en repli)
 try:
-    from app.pdf_generation.report_generator import ReportGenerator
-    PDF_AVAILABLE = True
-    logger.info("✅ Générateur PDF disponible")
-except ImportError as e:
-    logger.warning(f"⚠️ Générateur PDF non disponible: {e}")
-    PDF_AVAILABLE = False
+    import orjson
+    ORJSON_AVAILABLE = True
+    
+    def dumps_json(obj):
+        return orjson.dumps(obj)
+    
+    loads_json = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    
+    def dumps_json(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    
+    loads_json = json.loads
+
+
+def ojson(obj, status=200):
+    """Réponse JSON (remplace jsonify, sérialisée par orjson si disponible)"""
+    return Response(dumps_json(obj), status=status, mimetype='application/json')
+
+
+def compounds_response():
+    """Statut, corps sérialisé et ETag de /api/compounds, construits une seule fois"""
+    global _COMPOUNDS_RESPONSE
+    if _COMPOUNDS_RESPONSE is None:
+        if _load_modules():
+            compounds_data = _build_compounds_list()
+            logger.info(f"✅ {len(compounds_data)} composés préchargés")
+            status, body = 200, dumps_json({
+                'success': True,
+                'count': len(compounds_data),
+                'compounds': compounds_data
+            })
+        else:
+            status, body = 500, dumps_json({
+                'success': False,
+                'error': 'Modules non chargés. Installer: pip install thermo chemicals'
+            })
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        _COMPOUNDS_RESPONSE = (status, body, etag)
+    return _COMPOUNDS_RESPONSE
+
+
+# Cache en mémoire : LRU borné + éviction « oublieuse » probabiliste sur les hits
+MEMORY_CACHE = OrderedDict()
+MEMORY_CACHE_MAX_SIZE = 256
+_CACHE_HITS = {}
+
+# Stockage des résultats pour PDF (LRU borné, le disque sert de repli)
+RESULTS_STORAGE = OrderedDict()
+RESULTS_STORAGE_MAX_SIZE = 128
+
+_CACHE_LOCK = threading.Lock()
+
+
+def cache_get(key):
+    """Lit MEMORY_CACHE (corps JSON sérialisé, ETag) ; None si absent
+    
+    À chaque hit, l'entrée est oubliée avec une probabilité 1/max(hits, 10) :
+    les entrées froides ou corrompues finissent par être recalculées, les
+    entrées très demandées restent en place.
+    """
+    with _CACHE_LOCK:
+        value = MEMORY_CACHE.get(key)
+        if value is None:
+            return None
+        hits = _CACHE_HITS.get(key, 0) + 1
+        if random.random() < 1.0 / max(hits, 10):
+            del MEMORY_CACHE[key]
+            _CACHE_HITS.pop(key, None)
+        else:
+            MEMORY_CACHE.move_to_end(key)
+            _CACHE_HITS[key] = hits
+        return value
+
+
+def cache_put(key, value):
+    """Ajoute une entrée à MEMORY_CACHE (éviction de la moins récemment utilisée)"""
+    with _CACHE_LOCK:
+        MEMORY_CACHE[key] = value
+        MEMORY_CACHE.move_to_end(key)
+        if len(MEMORY_CACHE) > MEMORY_CACHE_MAX_SIZE:
+            old_key, _ = MEMORY_CACHE.popitem(last=False)
+            _CACHE_HITS.pop(old_key, None)
+
+
+# Écritures disque hors du chemin de la requête
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='results-io')
+
+
+def _write_results(path, payload):
+    """Écrit results.json en arrière-plan (les erreurs sont journalisées)
+    
+    Le dossier de session est créé ici, hors du chemin de la requête ;
+    write_bytes fait un unique open/write/close sans couche texte.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+    except OSError as e:
+        logger.error(f"❌ Écriture impossible de {path}: {e}")
+
+
+def store_result(session_id, data):
+    """Conserve les résultats d'une session pour le PDF (LRU borné)"""
+    with _CACHE_LOCK:
+        RESULTS_STORAGE[session_id] = data
+        RESULTS_STORAGE.move_to_end(session_id)
+        if len(RESULTS_STORAGE) > RESULTS_STORAGE_MAX_SIZE:
+            RESULTS_STORAGE.popitem(last=False)
+
+
+# Champs obligatoires de la requête /api/simulate
+_REQUIRED = frozenset(('compounds', 'feed_flow', 'feed_composition', 'pressure'))
+
+# Champs de résultats renvoyés par /api/simulate, par type JSON
+_FLOAT_KEYS = ('N_min', 'N_theoretical', 'R_min', 'R', 'D', 'B',
+               'alpha_avg', 'theta', 'efficiency', 'L', 'V')
+_INT_KEYS = ('N_real', 'feed_stage', 'N_R', 'N_S')
+_ARRAY_KEYS = ('x_D', 'x_B')
+
+
+def _serialize_results(results):
+    """Convertit les résultats du dimensionnement en types Python natifs"""
+    fallback = {
+        'N_theoretical': results['N_real'] * results['efficiency'],
+        'L': 0.0,
+        'V': 0.0
+    }
+    out = {k: float(results[k] if k in results else fallback[k]) for k in _FLOAT_KEYS}
+    out.update({k: int(results[k]) for k in _INT_KEYS})
+    out.update({k: np.asarray(results[k], dtype=np.float64).tolist() for k in _ARRAY_KEYS})
+    return out
+
+
+def make_cache_key(data):
+    """Clé de cache déterministe (indépendante de l'ordre des clés et de PYTHONHASHSEED)"""
+    if ORJSON_AVAILABLE:
+        canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    else:
+        canonical = json.dumps(data, sort_keys=True, separators=(',', ':'),
+                               ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+def send_pdf(pdf_path, session_id):
+    """Envoie le rapport PDF (If-Modified-Since / If-None-Match → 304)
+    
+    Chemin absolu : send_file résout les chemins relatifs depuis root_path,
+    alors que results/ est relatif au dossier de travail.
+    """
+    return send_file(
+        pdf_path.resolve(),
+        as_attachment=True,
+        download_name=f'rapport_distillation_{session_id}.pdf',
+        mimetype='application/pdf',
+        conditional=True
+    )
 
-# Cache en mémoire
-MEMORY_CACHE = {}
-RESULTS_STORAGE = {}  # Stockage des résultats pour PDF
 
 def create_app():
     """Crée l'application Flask avec templates"""
@@ -48,6 +304,8 @@ def create_app():
                 static_folder='static')
     
     app.config['SECRET_KEY'] = 'dev-secret-key'
+    # Derrière nginx/Apache : le serveur frontal envoie les PDF (X-Sendfile)
+    app.config['USE_X_SENDFILE'] = bool(int(os.getenv('USE_X_SENDFILE', '0')))
     CORS(app)
     
     # Créer les dossiers nécessaires
@@ -66,13 +324,13 @@ def create_app():
     @app.route('/health')
     def health():
         """Health check"""
-        return jsonify({
+        return ojson({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
             'version': '2.0.0',
             'mode': 'development',
-            'modules': MODULES_AVAILABLE,
-            'pdf': PDF_AVAILABLE
+            'modules': 'not_loaded' if MODULES_AVAILABLE is None else MODULES_AVAILABLE,
+            'pdf': 'not_loaded' if PDF_AVAILABLE is None else PDF_AVAILABLE
         })
     
     # =========================================================================
@@ -82,86 +340,90 @@ def create_app():
     @app.route('/api/compounds', methods=['GET'])
     def get_compounds():
         """Liste des composés disponibles"""
-        if not MODULES_AVAILABLE:
-            return jsonify({
-                'success': False,
-                'error': 'Modules non chargés. Installer: pip install thermo chemicals'
-            }), 500
+        status, body, etag = compounds_response()
+        if status != 200:
+            return Response(body, status=status, mimetype='application/json')
         
-        try:
-            common_compounds = [
-                'benzene', 'toluene', 'o-xylene',
-                'ethanol', 'methanol', 'acetone',
-                'propanol', 'butanol', 'p-xylene', 'm-xylene'
-            ]
-            
-            compounds_data = []
-            for name in common_compounds:
-                try:
-                    comp = Compound(name)
-                    compounds_data.append({
-                        'name': name,
-                        'Tb': round(comp.Tb - 273.15, 2),
-                        'Tc': round(comp.Tc - 273.15, 2) if comp.Tc else None,
-                        'MW': round(comp.MW, 2)
-                    })
-                except Exception as e:
-                    logger.debug(f"Impossible de charger {name}: {e}")
-                    continue
-            
-            return jsonify({
-                'success': True,
-                'count': len(compounds_data),
-                'compounds': compounds_data
-            })
-        
-        except Exception as e:
-            logger.error(f"Erreur get_compounds: {e}")
-            return jsonify({'success': False, 'error': str(e)}), 500
+        # Liste fixe pour la durée du processus : revalidation par ETag
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'max-age=3600'
+        return response
     
     @app.route('/api/simulate', methods=['POST'])
     def simulate():
         """Lancer une simulation"""
-        if not MODULES_AVAILABLE:
-            return jsonify({
+        if not _load_modules():
+            return ojson({
                 'success': False,
                 'error': 'Modules non chargés'
-            }), 500
+            }, 500)
         
         try:
-            data = request.get_json()
+            try:
+                data = loads_json(request.get_data())
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                return ojson({
+                    'success': False,
+                    'error': 'Corps JSON invalide'
+                }, 400)
             
-            # Validation basique
-            required = ['compounds', 'feed_flow', 'feed_composition', 'pressure']
-            for field in required:
-                if field not in data:
-                    return jsonify({
-                        'success': False,
-                        'error': f'Champ manquant: {field}'
-                    }), 400
+            # Validation basique (tous les champs manquants en une fois)
+            missing = _REQUIRED.difference(data)
+            if missing:
+                return ojson({
+                    'success': False,
+                    'error': f"Champs manquants: {', '.join(sorted(missing))}"
+                }, 400)
+            
+            # Normalisation unique des entrées : float64 contigu, somme = 1
+            try:
+                z_F = np.ascontiguousarray(data['feed_composition'], dtype=np.float64)
+                feed_flow = float(data['feed_flow'])
+                pressure = float(data['pressure'])
+            except (TypeError, ValueError):
+                return ojson({
+                    'success': False,
+                    'error': 'Valeurs numériques invalides'
+                }, 400)
+            
+            z_sum = z_F.sum() if z_F.ndim == 1 else 0.0
+            if z_sum <= 0:
+                return ojson({
+                    'success': False,
+                    'error': 'feed_composition doit être une liste de fractions positives'
+                }, 400)
+            z_F /= z_sum
             
             # Vérifier le cache
-            cache_key = str(hash(str(data)))
-            if cache_key in MEMORY_CACHE:
+            cache_key = make_cache_key(data)
+            cached = cache_get(cache_key)
+            if cached is not None:
+                # Réponse déjà sérialisée : aucun encodage JSON sur un hit.
+                # If-None-Match n'est pas évalué : un 304 n'est permis que
+                # pour GET/HEAD (revalidation via /api/results/<session_id>)
+                body, etag = cached
                 logger.info("✅ Résultat du cache mémoire")
-                return jsonify({
-                    'success': True,
-                    'from_cache': True,
-                    'results': MEMORY_CACHE[cache_key]
-                })
+                response = Response(body, mimetype='application/json')
+                response.set_etag(etag)
+                return response
             
             # Créer les composés
             logger.info(f"📦 Création des composés: {data['compounds']}")
-            compounds = [Compound(name) for name in data['compounds']]
-            thermo = ThermodynamicPackage(compounds)
+            thermo = get_thermo_package(data['compounds'])
             
             # Simulation
             logger.info("⚙️ Initialisation de la simulation...")
             shortcut = ShortcutDistillation(
                 thermo,
-                data['feed_flow'],
-                data['feed_composition'],
-                data['pressure']
+                feed_flow,
+                z_F,
+                pressure
             )
             
             logger.info("🔄 Exécution du dimensionnement...")
@@ -173,7 +435,11 @@ def create_app():
                 efficiency=data.get('efficiency', 0.70)
             )
             
-            session_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # Identifiant unique même pour deux requêtes dans la même seconde,
+            # dérivé du même instant que l'horodatage
+            now = datetime.now(timezone.utc)
+            session_id = f"{int(now.timestamp() * 1000):x}-{secrets.token_hex(3)}"
+            timestamp = now.isoformat()
             
             response_data = {
                 'session_id': session_id,
@@ -181,134 +447,190 @@ def create_app():
                 'feed_flow': data['feed_flow'],
                 'feed_composition': data['feed_composition'],
                 'pressure': data['pressure'],
-                'results': {
-                    'N_min': float(results['N_min']),
-                    'N_real': int(results['N_real']),
-                    'N_theoretical': float(results.get('N_theoretical', results['N_real'] * results['efficiency'])),
-                    'R_min': float(results['R_min']),
-                    'R': float(results['R']),
-                    'feed_stage': int(results['feed_stage']),
-                    'D': float(results['D']),
-                    'B': float(results['B']),
-                    'x_D': [float(x) for x in results['x_D']],
-                    'x_B': [float(x) for x in results['x_B']],
-                    'N_R': int(results['N_R']),
-                    'N_S': int(results['N_S']),
-                    'alpha_avg': float(results['alpha_avg']),
-                    'theta': float(results['theta']),
-                    'efficiency': float(results['efficiency']),
-                    'L': float(results.get('L', 0)),
-                    'V': float(results.get('V', 0))
-                },
-                'timestamp': datetime.now().isoformat()
+                'results': _serialize_results(results),
+                'timestamp': timestamp
             }
             
             # Stocker pour PDF
-            RESULTS_STORAGE[session_id] = response_data
+            store_result(session_id, response_data)
             
             # Sauvegarder sur disque
-            results_dir = Path('results') / session_id
-            results_dir.mkdir(parents=True, exist_ok=True)
+            results_file = Path('results') / session_id / 'results.json'
+            _IO_POOL.submit(_write_results, results_file, dumps_json(response_data))
             
-            results_file = results_dir / 'results.json'
-            with open(results_file, 'w', encoding='utf-8') as f:
-                json.dump(response_data, f, indent=2, ensure_ascii=False)
-            
-            # Mettre en cache
-            MEMORY_CACHE[cache_key] = response_data
-            
-            logger.info(f"✅ Simulation complétée: {session_id}")
-            
-            return jsonify({
+            # Chaque ETag est calculé sur le corps exact qu'il accompagne
+            body = dumps_json({
                 'success': True,
                 'from_cache': False,
                 'results': response_data
             })
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+            
+            # Mettre en cache la réponse sérialisée et son ETag
+            cached_body = dumps_json({
+                'success': True,
+                'from_cache': True,
+                'results': response_data
+            })
+            cached_etag = hashlib.blake2b(cached_body, digest_size=16).hexdigest()
+            cache_put(cache_key, (cached_body, cached_etag))
+            
+            logger.info(f"✅ Simulation complétée: {session_id}")
+            
+            response = Response(body, mimetype='application/json')
+            response.set_etag(etag)
+            return response
             
         except Exception as e:
             logger.error(f"❌ Erreur simulation: {e}", exc_info=True)
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': str(e),
                 'type': type(e).__name__
-            }), 500
+            }, 500)
+    
+    @app.route('/api/results/<session_id>', methods=['GET'])
+    def get_results(session_id):
+        """Résultats d'une session (results.json compact ; ?pretty=1 pour les lire)"""
+        if not session_id.replace('-', '').replace('_', '').isalnum():
+            return ojson({
+                'success': False,
+                'error': f'Session {session_id} non trouvée'
+            }, 404)
+        
+        pretty = request.args.get('pretty') == '1'
+        results = RESULTS_STORAGE.get(session_id)
+        if results is None:
+            results_file = Path('results') / session_id / 'results.json'
+            if not results_file.exists():
+                return ojson({
+                    'success': False,
+                    'error': f'Session {session_id} non trouvée'
+                }, 404)
+            body = results_file.read_bytes()
+            if pretty:
+                results = loads_json(body)
+        else:
+            body = None
+        
+        if pretty:
+            body = json.dumps(results, indent=2, ensure_ascii=False).encode('utf-8')
+        elif body is None:
+            body = dumps_json(results)
+        
+        # Résultats figés pour la session : revalidation par ETag (304 sur GET)
+        response = Response(body, mimetype='application/json')
+        response.set_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+        return response.make_conditional(request)
     
     @app.route('/api/generate_pdf/<session_id>', methods=['GET'])
     def generate_pdf(session_id):
-        """Génère un rapport PDF pour une simulation"""
-        if not PDF_AVAILABLE:
-            return jsonify({
+        """Génère un rapport PDF pour une simulation (une seule fois par session)"""
+        if not session_id.replace('-', '').replace('_', '').isalnum():
+            return ojson({
+                'success': False,
+                'error': f'Session {session_id} non trouvée'
+            }, 404)
+        
+        # Les résultats d'une session sont figés : un rapport déjà généré est
+        # renvoyé tel quel, sa date et son ETag stables permettent les 304
+        pdf_path = Path('results') / session_id / f'rapport_{session_id}.pdf'
+        if pdf_path.exists():
+            return send_pdf(pdf_path, session_id)
+        
+        if not _load_pdf():
+            return ojson({
                 'success': False,
                 'error': 'Générateur PDF non disponible. Installer: pip install reportlab matplotlib'
-            }), 500
+            }, 500)
         
         try:
             # Chercher dans le cache mémoire d'abord
-            if session_id in RESULTS_STORAGE:
-                results = RESULTS_STORAGE[session_id]
+            results = RESULTS_STORAGE.get(session_id)
+            if results is not None:
                 logger.info(f"📄 Résultats trouvés en mémoire pour {session_id}")
             else:
                 # Sinon chercher sur disque
                 results_file = Path('results') / session_id / 'results.json'
                 if not results_file.exists():
-                    return jsonify({
+                    return ojson({
                         'success': False,
                         'error': f'Session {session_id} non trouvée'
-                    }), 404
+                    }, 404)
                 
-                with open(results_file, 'r', encoding='utf-8') as f:
-                    results = json.load(f)
+                with open(results_file, 'rb') as f:
+                    results = loads_json(f.read())
                 logger.info(f"📄 Résultats chargés depuis disque pour {session_id}")
             
-            # Générer le PDF
-            pdf_path = Path('results') / session_id / f'rapport_{session_id}.pdf'
+            # Générer le PDF (fichier temporaire renommé : jamais de rapport
+            # partiel servi par une requête concurrente)
             pdf_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = pdf_path.with_name(f'{pdf_path.stem}.{secrets.token_hex(4)}.tmp')
             
             logger.info(f"🔄 Génération PDF en cours...")
             generator = ReportGenerator()
-            generator.generate_report(results, str(pdf_path))
+            generator.generate_report(results, str(tmp_path))
+            tmp_path.replace(pdf_path)
             
             logger.info(f"✅ PDF généré: {pdf_path}")
             
-            return send_file(
-                pdf_path,
-                as_attachment=True,
-                download_name=f'rapport_distillation_{session_id}.pdf',
-                mimetype='application/pdf'
-            )
+            return send_pdf(pdf_path, session_id)
         
         except Exception as e:
             logger.error(f"❌ Erreur génération PDF: {e}", exc_info=True)
-            return jsonify({
+            return ojson({
                 'success': False,
                 'error': str(e),
                 'type': type(e).__name__
-            }), 500
+            }, 500)
     
     return app
 
 
+# Application au niveau module pour les serveurs WSGI (gunicorn run-dev:app)
+app = create_app()
+
+# Mode debug (débogueur + rechargement auto) uniquement sur demande explicite
+DEBUG = os.getenv('FLASK_DEBUG') == '1'
+
+
 if __name__ == '__main__':
+    # FLASK_ENV=development : serveur Werkzeug (debug si FLASK_DEBUG=1).
+    # Sinon : serveur WSGI waitress multi-threads (simulations concurrentes).
+    dev_mode = os.getenv('FLASK_ENV') == 'development'
+    threads = int(os.getenv('THREADS', 8))
+    
     print("=" * 80)
     print("🚀 Démarrage de l'application Distillation Multicomposants")
-    print("   MODE: Développement avec Interface Web + PDF")
+    if dev_mode:
+        print(f"   MODE: Développement{' (debug)' if DEBUG else ''} avec Interface Web + PDF")
+    else:
+        print(f"   MODE: Production (waitress, {threads} threads) avec Interface Web + PDF")
     print("=" * 80)
     
-    app = create_app()
-    
     port = int(os.getenv('PORT', 5000))
     
     print(f"\n✅ Serveur démarré sur: http://localhost:{port}")
     print(f"🌐 Interface Web: http://localhost:{port}")
     print(f"🏥 Health check: http://localhost:{port}/health")
     print(f"📋 API Composés: http://localhost:{port}/api/compounds")
-    print(f"📄 PDF: Activé" if PDF_AVAILABLE else "⚠️  PDF: Non disponible")
+    print(f"📄 PDF: Activé" if _load_pdf() else "⚠️  PDF: Non disponible")
     print(f"\n💡 Appuyez sur Ctrl+C pour arrêter\n")
     print("=" * 80)
     
-    app.run(
-        host='0.0.0.0',
-        port=port,
-        debug=True,
-        use_reloader=True
-    )
\ No newline at end of file
+    if dev_mode:
+        app.run(
+            host='0.0.0.0',
+            port=port,
+            debug=DEBUG,
+            use_reloader=DEBUG
+        )
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("⚠️  waitress non installé, repli sur le serveur Flask multi-threads")
+            # Pas de rechargement auto : évite de recompiler les caches JIT deux fois
+            app.run(host='0.0.0.0', port=port, threaded=True, use_reloader=False)
+        else:
+            serve(app, host='0.0.0.0', port=port, threads=threads)
@@ -6,4 +6,7 @@ config_name = os.getenv('FLASK_ENV', 'development')
 app, socketio = create_app(config_name)
 
 if __name__ == '__main__':
-    socketio.run(app, host=app.config['HOST'], port=app.config['PORT'], debug=app.config['DEBUG'])
+    # Debug et rechargement auto uniquement sur demande explicite (FLASK_DEBUG=1)
+    debug = app.config['DEBUG'] and os.getenv('FLASK_DEBUG') == '1'
+    socketio.run(app, host=app.config['HOST'], port=app.config['PORT'],
+                 debug=debug, use_reloader=debug)
@@ -0,0 +1,162 @@
+"""
+Tests de l'API de développement (run-dev.py) : clés de cache, ETag/304 et résultats
+"""
+
+import hashlib
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+PAYLOAD = {
+    'compounds': ['benzene', 'toluene', 'o-xylene'],
+    'feed_flow': 100,
+    'feed_composition': [0.333, 0.333, 0.334],
+    'pressure': 101325
+}
+
+
+@pytest.fixture(scope='module')
+def rd(tmp_path_factory):
+    """Module run-dev importé depuis un dossier de travail temporaire"""
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('app'))
+    try:
+        module = importlib.import_module('run-dev')
+        yield module
+        # Laisser finir les écritures de results.json avant de quitter le dossier
+        module._IO_POOL.shutdown(wait=True)
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def client(rd, monkeypatch):
+    """Client de test ; l'éviction probabiliste du cache est désactivée"""
+    monkeypatch.setattr(rd.random, 'random', lambda: 1.0)
+    return rd.app.test_client()
+
+
+def blake2b_hex(body):
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def test_make_cache_key_is_deterministic(rd):
+    key = rd.make_cache_key(PAYLOAD)
+
+    assert key == rd.make_cache_key(dict(reversed(list(PAYLOAD.items()))))
+    assert len(key) == 32 and int(key, 16) >= 0
+    assert key != rd.make_cache_key({**PAYLOAD, 'pressure': 200000})
+
+
+def test_compounds_etag_and_304(client):
+    first = client.get('/api/compounds')
+    etag, weak = first.get_etag()
+
+    assert first.status_code == 200 and not weak
+    assert first.get_json()['success']
+
+    again = client.get('/api/compounds', headers={'If-None-Match': f'"{etag}"'})
+    assert again.status_code == 304
+    assert again.get_etag()[0] == etag
+    assert again.data == b''
+
+
+def test_simulate_etag_is_not_evaluated_on_post(rd, client):
+    rd.MEMORY_CACHE.clear()
+    payload = {**PAYLOAD, 'reflux_factor': 1.4}
+
+    first = client.post('/api/simulate', json=payload)
+    first_etag = first.get_etag()[0]
+    assert first.status_code == 200
+    assert first.get_json()['from_cache'] is False
+    assert first_etag == blake2b_hex(first.data)
+
+    # Un POST n'obtient jamais de 304, même avec un ETag connu ou « * »
+    for tag in (f'"{first_etag}"', '*'):
+        cached = client.post('/api/simulate', json=payload, headers={'If-None-Match': tag})
+        assert cached.status_code == 200
+        assert cached.get_json()['from_cache'] is True
+        assert cached.get_etag()[0] == blake2b_hex(cached.data) != first_etag
+
+
+def test_results_revalidation_on_get(client):
+    session_id = client.post('/api/simulate', json=PAYLOAD).get_json()['results']['session_id']
+
+    first = client.get(f'/api/results/{session_id}')
+    etag = first.get_etag()[0]
+    assert first.status_code == 200
+    assert etag == blake2b_hex(first.data)
+
+    again = client.get(f'/api/results/{session_id}', headers={'If-None-Match': f'"{etag}"'})
+    assert again.status_code == 304
+    assert again.data == b''
+
+    stale = client.get(f'/api/results/{session_id}', headers={'If-None-Match': '"0"'})
+    assert stale.status_code == 200
+
+
+def test_results_from_memory(rd, client):
+    rd.MEMORY_CACHE.clear()
+    simulated = client.post('/api/simulate', json=PAYLOAD).get_json()['results']
+    session_id = simulated['session_id']
+
+    response = client.get(f'/api/results/{session_id}')
+    assert response.status_code == 200
+    assert response.get_json() == simulated
+
+    pretty = client.get(f'/api/results/{session_id}?pretty=1')
+    assert pretty.status_code == 200
+    assert b'\n  ' in pretty.data
+
+
+def test_results_from_disk(client):
+    results_file = Path('results') / 'disk-only_1' / 'results.json'
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    results_file.write_bytes(b'{"session_id":"disk-only_1"}')
+
+    response = client.get('/api/results/disk-only_1')
+    assert response.status_code == 200
+    assert response.get_json() == {'session_id': 'disk-only_1'}
+
+
+@pytest.mark.parametrize('session_id', ['unknown-session', 'bad.id', 'a%24b', '..'])
+def test_results_rejected_or_unknown(client, session_id):
+    # Un dossier existant ne doit pas rendre accessible un identifiant invalide
+    results_file = Path('results') / 'bad.id' / 'results.json'
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    results_file.write_bytes(b'{}')
+
+    response = client.get(f'/api/results/{session_id}')
+    assert response.status_code == 404
+    assert response.get_json()['success'] is False
+
+
+def test_existing_pdf_is_served_conditionally(client):
+    pdf_path = Path('results') / 'pdf-session' / 'rapport_pdf-session.pdf'
+    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    pdf_path.write_bytes(b'%PDF-1.4\n%%EOF\n')
+
+    first = client.get('/api/generate_pdf/pdf-session')
+    assert first.status_code == 200
+    assert first.data == pdf_path.read_bytes()
+    first.close()
+
+    etag = first.get_etag()[0]
+    again = client.get('/api/generate_pdf/pdf-session', headers={'If-None-Match': f'"{etag}"'})
+    assert again.status_code == 304
+
+    again = client.get('/api/generate_pdf/pdf-session',
+                       headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert again.status_code == 304
+
+
+def test_pdf_rejects_invalid_session_id(client):
+    assert client.get('/api/generate_pdf/bad.id').status_code == 404
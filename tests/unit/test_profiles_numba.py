@@ -0,0 +1,47 @@
+"""
+Tests du noyau compilé de profils (profiles_numba) contre la version NumPy
+"""
+
+import numpy as np
+import pytest
+
+from distillation_multicomposants import Compound, ThermodynamicPackage
+from profiles_numba import antoine_arrays, build_profiles
+
+
+P = 101325.0
+
+
+@pytest.fixture(scope='module')
+def btx():
+    """Package thermodynamique BTX partagé par les tests du module"""
+    compounds = [Compound(name) for name in ['benzene', 'toluene', 'o-xylene']]
+    return compounds, ThermodynamicPackage(compounds)
+
+
+def linear_profiles(N_real, feed, x_D, x_B, z_F):
+    """Profils de composition linéaires, comme dans exemple_btx (voie NumPy)"""
+    x = np.empty((N_real, z_F.shape[0]))
+    n_rect = min(feed, N_real)
+    x[:n_rect] = x_D + (np.arange(n_rect) / feed)[:, None] * (z_F - x_D)
+    ratios_s = np.arange(1, N_real - n_rect + 1) / max(N_real - feed, 1)
+    x[n_rect:] = z_F + ratios_s[:, None] * (x_B - z_F)
+    return x / x.sum(axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize('N_real, feed', [(12, 6), (7, 5), (20, 1)])
+def test_build_profiles_matches_bubble_temperature_batch(btx, N_real, feed):
+    compounds, thermo = btx
+    x_D = np.array([0.95, 0.045, 0.005])
+    x_B = np.array([0.01, 0.49, 0.50])
+    z_F = np.array([0.333, 0.333, 0.334])
+
+    x, y, T = build_profiles(N_real, feed, x_D, x_B, z_F, *antoine_arrays(compounds), P)
+
+    x_ref = linear_profiles(N_real, feed, x_D, x_B, z_F)
+    T_ref, y_ref, converged = thermo.bubble_temperature_batch(P, x_ref)
+
+    assert converged.all()
+    np.testing.assert_allclose(x, x_ref, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(T, T_ref, rtol=0, atol=1e-5)
+    np.testing.assert_allclose(y, y_ref, rtol=0, atol=1e-8)
@@ -0,0 +1,65 @@
+"""
+Tests de la résolution vectorisée des températures de bulle (app.core)
+"""
+
+import numpy as np
+import pytest
+
+from app.core.compound import Compound
+from app.core.thermodynamics import ThermodynamicPackage
+
+
+P = 101325.0
+
+
+@pytest.fixture(scope='module')
+def thermo():
+    """Package thermodynamique BTX partagé par les tests du module"""
+    return ThermodynamicPackage([Compound(name) for name in ['benzene', 'toluene', 'o-xylene']])
+
+
+@pytest.fixture(scope='module')
+def X():
+    """Compositions liquides aléatoires (reproductibles)"""
+    return np.random.default_rng(0).dirichlet([1.0, 1.0, 1.0], size=10)
+
+
+def test_batch_matches_scalar_bubble_temperature(thermo, X):
+    T, Y, converged = thermo.bubble_temperature_batch(P, X)
+
+    assert converged.all()
+    assert T.shape == (len(X),)
+    assert Y.shape == X.shape
+    np.testing.assert_allclose(Y.sum(axis=1), 1.0)
+    for x, T_batch, y_batch in zip(X, T, Y):
+        # Antoine ajusté (lot) contre pression de vapeur tabulée (scalaire)
+        T_scalar, y_scalar = thermo.bubble_temperature(P, x)
+        assert T_batch == pytest.approx(T_scalar, abs=0.1)
+        np.testing.assert_allclose(y_batch, y_scalar, atol=2e-3)
+
+
+def test_scalar_T_guess_is_broadcast(thermo, X):
+    T_ref, _, _ = thermo.bubble_temperature_batch(P, X)
+    T, _, converged = thermo.bubble_temperature_batch(P, X, T_guess=360.0)
+
+    assert converged.all()
+    np.testing.assert_allclose(T, T_ref, atol=1e-6)
+
+
+def test_bisection_fallback_rows(thermo, X):
+    # Sans itération de Newton, toutes les lignes passent par la bissection
+    T_ref, Y_ref, _ = thermo.bubble_temperature_batch(P, X)
+    T, Y, converged = thermo.bubble_temperature_batch(P, X, max_iter=0)
+
+    assert converged.all()
+    np.testing.assert_allclose(T, T_ref, atol=1e-5)
+    np.testing.assert_allclose(Y, Y_ref, atol=1e-6)
+
+
+def test_bisection_reports_rows_without_root(thermo, X):
+    # Une ligne sans composé n'a pas de température de bulle : non convergée
+    X_bad = np.vstack([X[:2], np.zeros(X.shape[1])])
+    with np.errstate(all='ignore'):
+        _, _, converged = thermo.bubble_temperature_batch(P, X_bad)
+
+    np.testing.assert_array_equal(converged, [True, True, False])
@@ -0,0 +1,49 @@
+"""
+Tests du sous-échantillonnage LTTB des profils et du pool de figures (visualization)
+"""
+
+import numpy as np
+
+from visualization import DistillationVisualizer, downsample_profile, lttb_indices
+
+
+def test_lttb_short_series_is_unchanged():
+    x = np.arange(10)
+    np.testing.assert_array_equal(lttb_indices(x, np.sin(x), n_out=20), np.arange(10))
+
+
+def test_lttb_keeps_endpoints_and_size():
+    x = np.arange(1, 2001)
+    y = np.sin(x / 50.0)
+    idx = lttb_indices(x, y, n_out=100)
+
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_isolated_peak():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[437] = 10.0
+    assert 437 in lttb_indices(x, y, n_out=50)
+
+
+def test_downsample_profile_shares_stages_across_columns():
+    stages = np.arange(1, 1001)
+    values = np.column_stack([np.sin(stages / 40.0), np.cos(stages / 70.0)])
+    s, v = downsample_profile(stages, values, n_out=100)
+
+    assert len(s) <= 100
+    assert v.shape == (len(s), 2)
+    assert s[0] == stages[0] and s[-1] == stages[-1]
+
+
+def test_pooled_figure_gives_identical_png():
+    visualizer = DistillationVisualizer(['benzene', 'toluene', 'o-xylene'])
+    stages = np.arange(1, 13)
+    T = np.linspace(355.0, 400.0, 12)
+
+    first = visualizer.plot_temperature_profile(stages, T, 6, return_bytes=True)
+    second = visualizer.plot_temperature_profile(stages, T, 6, return_bytes=True)
+    assert first == second
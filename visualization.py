@@ -6,24 +6,153 @@ Utilise Plotly pour créer des graphiques interactifs (style D3.js)
 Auteur: Prof. BAKHER Zine Elabidine
 """
 
+import io
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, FancyArrow, Rectangle
+from functools import lru_cache, wraps
+
+# Modules de tracé importés au premier usage (voir _lazy_mpl/_lazy_plotly) :
+# `import visualization` et print_design_summary ne chargent ni matplotlib,
+# ni Pillow, ni Plotly
+matplotlib = mcolors = Figure = FigureCanvasAgg = font_manager = None
+Image = ImageDraw = ImageFont = None
+pio = None
+PLOTLY_AVAILABLE = None
+
+
+def _lazy_mpl():
+    """Importe matplotlib et Pillow au premier appel"""
+    global matplotlib, mcolors, Figure, FigureCanvasAgg, font_manager
+    global Image, ImageDraw, ImageFont
+    if FigureCanvasAgg is not None:
+        return
+    # Les figures sont créées hors écran (Figure + FigureCanvasAgg, sans
+    # pyplot) : le backend global de matplotlib n'est pas modifié
+    import matplotlib
+    import matplotlib.colors as mcolors
+    from matplotlib import font_manager
+    from matplotlib.figure import Figure
+    from PIL import Image, ImageDraw, ImageFont
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+# Profils à nombreux plateaux : chemins simplifiés et envoyés à Agg par blocs.
+# Appliqué localement (rc_context) aux seuls tracés de profils.
+_PROFILE_RC = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
+
+
+def _with_profile_rc(method):
+    """Exécute un tracé de profil (construction et enregistrement) sous _PROFILE_RC"""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with matplotlib.rc_context(_PROFILE_RC):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _lazy_plotly():
+    """Importe plotly.io au premier tracé interactif ; renvoie PLOTLY_AVAILABLE"""
+    global pio, PLOTLY_AVAILABLE
+    if PLOTLY_AVAILABLE is None:
+        try:
+            import plotly.io as pio
+            PLOTLY_AVAILABLE = True
+        except ImportError:
+            PLOTLY_AVAILABLE = False
+    return PLOTLY_AVAILABLE
+
+# Au-delà de ce nombre de plateaux, les profils sont sous-échantillonnés (LTTB)
+# avant tracé : le coût de rendu reste constant pour les colonnes très hautes
+LTTB_THRESHOLD = 500
+
+
+def lttb_indices(x, y, n_out=LTTB_THRESHOLD):
+    """
+    Indices retenus par l'algorithme LTTB (Largest-Triangle-Three-Buckets)
+    
+    Le premier et le dernier point sont conservés ; dans chaque intervalle
+    intermédiaire, on garde le point formant le plus grand triangle avec le
+    point retenu précédent et la moyenne de l'intervalle suivant.
+    
+    Parameters:
+    -----------
+    x : array (n,)
+        Abscisses croissantes (numéros de plateau)
+    y : array (n,)
+        Valeurs associées
+    n_out : int
+        Nombre de points à conserver
+    
+    Returns:
+    --------
+    idx : ndarray of int
+        Indices des points retenus (croissants)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    # n_out - 2 intervalles entre le premier et le dernier point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        nxt = slice(hi, edges[k + 2] if k + 2 < len(edges) else n)
+        x_avg, y_avg = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - x_avg) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (y_avg - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[k + 1] = a
+    return idx
+
+
+def downsample_profile(stages, values, n_out=LTTB_THRESHOLD):
+    """
+    Profil (stages, values) réduit par LTTB s'il dépasse n_out points
+    
+    values peut être 2D (une colonne par composé) : les indices retenus pour
+    chaque colonne sont réunis, tous les composés partagent alors les mêmes
+    plateaux (au plus n_out points au total).
+    """
+    if len(stages) <= n_out:
+        return stages, values
+    values = np.asarray(values)
+    if values.ndim == 1:
+        idx = lttb_indices(stages, values, n_out)
+    else:
+        n_col = max(n_out // values.shape[1], 3)
+        idx = np.unique(np.concatenate(
+            [lttb_indices(stages, col, n_col) for col in values.T]))
+    return np.asarray(stages)[idx], values[idx]
+
+
+@lru_cache(maxsize=16)
+def _schematic_font(size, bold=False, mono=False):
+    """Police TrueType (fournie avec matplotlib) pour le schéma Pillow"""
+    prop = font_manager.FontProperties(
+        family='monospace' if mono else 'sans-serif',
+        weight='bold' if bold else 'normal')
+    return ImageFont.truetype(font_manager.findfont(prop), size)
 
-try:
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-    import plotly.express as px
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
 
 class DistillationVisualizer:
     """
     Classe pour visualiser les résultats de distillation multicomposants
     """
     
+    # Couleurs RGB des sections (lightcoral, lightblue, lightgreen) :
+    # rectification, plateau d'alimentation, épuisement
+    SECTION_COLORS = np.array([[240, 128, 128], [173, 216, 230], [144, 238, 144]],
+                              dtype=np.uint8)
+    
     def __init__(self, compound_names):
         """
         Parameters:
@@ -31,34 +160,71 @@ class DistillationVisualizer:
         compound_names : list of str
             Noms des composés
         """
+        _lazy_mpl()
         self.compound_names = compound_names
         self.n_comp = len(compound_names)
-        self.colors = plt.cm.Set3(np.linspace(0, 1, self.n_comp))
-        
-        if PLOTLY_AVAILABLE:
-            self.plotly_colors = px.colors.qualitative.Set3[:self.n_comp]
+        self.colors = matplotlib.colormaps['Set3'](np.linspace(0, 1, self.n_comp))
+        # Couleurs converties une fois pour toutes en '#rrggbb', partagées
+        # par les tracés matplotlib et Plotly
+        self.colors_hex = [mcolors.to_hex(c) for c in self.colors]
+        
+        # Schémas de colonne déjà rendus (image RGBA) par géométrie
+        self._schema_cache = {}
+        # Figure des bilans matières, conservée entre deux appels
+        self._mb_artists = None
+        # Figures hors écran réutilisées, par (taille, disposition)
+        self._figure_pool = {}
     
-    def plot_material_balance(self, F, D, B, z_F, x_D, x_B, save_path='bilan_matiere.png'):
+    def plot_material_balance(self, F, D, B, z_F, x_D, x_B, save_path='bilan_matiere.png',
+                              return_bytes=False):
         """
         Visualise les bilans matières
+        
+        La figure est construite au premier appel puis conservée : lors d'une
+        étude paramétrique, les appels suivants ne modifient que les hauteurs
+        des barres, les étiquettes et l'échelle avant l'enregistrement.
+        Avec return_bytes=True, l'image PNG est renvoyée (bytes) au lieu
+        d'être écrite dans save_path.
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        flows = [F, D, B]
+        if self._mb_artists is None:
+            self._mb_artists = self._build_material_balance_figure(
+                flows, z_F, x_D, x_B)
+        else:
+            mb = self._mb_artists
+            for bar, label, flow in zip(mb['flow_bars'], mb['flow_labels'], flows):
+                bar.set_height(flow)
+                label.set_y(flow)
+                label.set_text(f'{flow:.1f}\nkmol/h')
+            mb['ax_flows'].set_ylim([0, max(flows) * 1.2])
+            for bars, comp in zip(mb['comp_bars'], (z_F, x_D, x_B)):
+                for bar, value in zip(bars, comp):
+                    bar.set_height(value)
+        
+        return self._save_figure(self._mb_artists['fig'], save_path, return_bytes)
+    
+    def _build_material_balance_figure(self, flows, z_F, x_D, x_B):
+        """Construit la figure des bilans matières et renvoie ses artistes modifiables"""
+        fig = Figure(figsize=(14, 6))
+        FigureCanvasAgg(fig)
+        ax1, ax2 = fig.subplots(1, 2)
         fig.suptitle('Bilans Matières de la Colonne de Distillation',
                      fontsize=14, fontweight='bold')
         
         # Graphique 1: Débits
         streams = ['Alimentation', 'Distillat', 'Résidu']
-        flows = [F, D, B]
         colors_streams = ['blue', 'green', 'red']
         
         bars = ax1.bar(streams, flows, color=colors_streams, alpha=0.7,
                       edgecolor='black', linewidth=2)
         
+        labels = []
         for bar, flow in zip(bars, flows):
             height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{flow:.1f}\nkmol/h',
-                    ha='center', va='bottom', fontweight='bold', fontsize=10)
+            labels.append(ax1.text(bar.get_x() + bar.get_width()/2., height,
+                                   f'{flow:.1f}\nkmol/h',
+                                   ha='center', va='bottom', fontweight='bold',
+                                   fontsize=10))
         
         ax1.set_ylabel('Débit (kmol/h)', fontsize=11, fontweight='bold')
         ax1.set_title('Débits des flux', fontsize=12, fontweight='bold')
@@ -85,16 +251,61 @@ class DistillationVisualizer:
         ax2.grid(True, alpha=0.3, axis='y')
         ax2.set_ylim([0, 1.0])
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        fig.tight_layout()
+        return {'fig': fig, 'ax_flows': ax1, 'flow_bars': bars,
+                'flow_labels': labels, 'comp_bars': (bars1, bars2, bars3)}
+    
+    def _get_figure(self, figsize, nrows=None, ncols=None):
+        """
+        Figure hors écran réutilisée d'un appel à l'autre
+        
+        Avec nrows/ncols, renvoie (fig, axes) comme fig.subplots, axes effacés ;
+        sans disposition, renvoie (fig, None) avec une figure vidée dont
+        l'appelant crée lui-même les axes.
+        """
+        key = (figsize, nrows, ncols)
+        entry = self._figure_pool.get(key)
+        if entry is None:
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+            axes = fig.subplots(nrows, ncols) if nrows else None
+            entry = self._figure_pool[key] = (fig, axes)
+        else:
+            fig, axes = entry
+            if axes is None:
+                fig.clear()
+            else:
+                for ax in fig.axes:
+                    ax.cla()
+            # Marges d'origine : tight_layout repart de l'état d'une figure neuve
+            fig.subplots_adjust(**{k: matplotlib.rcParams[f'figure.subplot.{k}']
+                                   for k in ('left', 'right', 'bottom', 'top',
+                                             'wspace', 'hspace')})
+        return entry
+    
+    def _save_figure(self, fig, save_path, return_bytes=False):
+        """
+        Enregistre la figure dans save_path, ou renvoie le PNG en mémoire
+        
+        En mémoire, le recadrage bbox_inches='tight' (qui impose un rendu
+        complet supplémentaire) est omis : la mise en page est déjà faite.
+        """
+        if return_bytes:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=300)
+            return buffer.getvalue()
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
         print(f"✓ Graphique sauvegardé: {save_path}")
-        plt.close()
     
-    def plot_shortcut_results(self, results, save_path='shortcut_results.png'):
+    def plot_shortcut_results(self, results, save_path='shortcut_results.png',
+                              return_bytes=False):
         """
         Visualise les résultats des méthodes simplifiées
+        
+        Avec return_bytes=True, l'image PNG est renvoyée (bytes) au lieu
+        d'être écrite dans save_path.
         """
-        fig = plt.figure(figsize=(16, 10))
+        fig, _ = self._get_figure((16, 10))
         gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
         fig.suptitle('Résultats du Dimensionnement (Méthodes Simplifiées)',
                      fontsize=16, fontweight='bold')
@@ -133,20 +344,23 @@ class DistillationVisualizer:
         
         # 4. Gilliland
         ax4 = fig.add_subplot(gs[1, 1])
+        # Courbe Y(X) de Gilliland évaluée une seule fois (décroissante en X)
+        X_num = np.linspace(0.01, 0.99, 100)
+        exponent = (1 + 54.4*X_num) * (X_num - 1) / ((11 + 117.2*X_num) * np.sqrt(X_num))
+        Y_curve = 1 - np.exp(exponent)
+        
+        # Inversion vectorisée Y -> X : point de la courbe le plus proche
         N_range = np.linspace(results['N_min'], results['N_min'] * 3, 50)
-        R_range = []
-        for N in N_range:
-            Y = (N - results['N_min']) / (N + 1)
-            if Y >= 0.999:
-                R_range.append(results['R_min'])
-            else:
-                X_num = np.linspace(0.01, 0.99, 100)
-                exponent = (1 + 54.4*X_num) * (X_num - 1) / ((11 + 117.2*X_num) * np.sqrt(X_num))
-                Y_curve = 1 - np.exp(exponent)
-                idx = np.argmin(np.abs(Y_curve - Y))
-                X = X_num[idx]
-                R = results['R_min'] + X * (1 + results['R_min']) / (1 - X) if X < 0.999 else results['R_min'] * 10
-                R_range.append(min(R, results['R_min'] * 5))
+        Y_vec = (N_range - results['N_min']) / (N_range + 1)
+        Y_asc = Y_curve[::-1]
+        pos = np.clip(np.searchsorted(Y_asc, Y_vec), 1, len(Y_asc) - 1)
+        take_left = (Y_vec - Y_asc[pos - 1]) <= (Y_asc[pos] - Y_vec)
+        X = X_num[len(Y_asc) - 1 - (pos - take_left)]
+        
+        # Bornes appliquées sur place (pas de tableau intermédiaire)
+        R_range = results['R_min'] + X * (1 + results['R_min']) / (1 - X)
+        np.minimum(R_range, results['R_min'] * 5, out=R_range)
+        R_range[Y_vec >= 0.999] = results['R_min']
         
         ax4.plot(R_range, N_range, 'b-', linewidth=2.5, label='Courbe de Gilliland')
         ax4.plot(results['R'], results['N_theoretical'], 'ro', markersize=12,
@@ -161,16 +375,18 @@ class DistillationVisualizer:
         ax4.set_title('Corrélation de Gilliland', fontsize=12, fontweight='bold')
         ax4.legend(fontsize=9)
         ax4.grid(True, alpha=0.3)
-        ax4.set_xlim([results['R_min'] * 0.9, max(R_range) * 1.1])
+        ax4.set_xlim([results['R_min'] * 0.9, R_range.max() * 1.1])
         
         # 5. Kirkbride
         ax5 = fig.add_subplot(gs[1, 2])
-        stages = list(range(1, results['N_real'] + 1))
-        colors_stages = ['lightcoral' if i < results['feed_stage'] 
-                        else 'lightblue' if i == results['feed_stage']
-                        else 'lightgreen' for i in stages]
-        
-        ax5.barh(stages, [1]*len(stages), color=colors_stages, edgecolor='black')
+        # Bande de couleurs par section en une seule image (au lieu d'une barre
+        # par plateau) : rectification / alimentation / épuisement
+        stages = np.arange(1, results['N_real'] + 1)
+        section = np.sign(stages - results['feed_stage']) + 1
+        color_arr = self.SECTION_COLORS[section][:, np.newaxis, :]
+        
+        ax5.imshow(color_arr, aspect='auto', interpolation='nearest',
+                   extent=[0, 1, results['N_real'] + 0.5, 0.5])
         ax5.axhline(y=results['feed_stage'], color='blue', linewidth=3,
                    label=f'Plateau alimentation: {results["feed_stage"]}')
         ax5.set_xlabel('Section', fontsize=11, fontweight='bold')
@@ -207,34 +423,87 @@ class DistillationVisualizer:
             ['Débit résidu', f'{results["B"]:.2f}', 'kmol/h', 'Bilan matière'],
         ]
         
-        table = ax6.table(cellText=table_data, cellLoc='left', loc='center',
+        # Couleurs de fond passées à la création : en-tête vert, lignes paires grisées
+        row_colors = ['#4CAF50'] + ['#f0f0f0' if i % 2 == 0 else 'white'
+                                    for i in range(1, len(table_data))]
+        cell_colors = [[c] * 4 for c in row_colors]
+        
+        table = ax6.table(cellText=table_data, cellColours=cell_colors,
+                         cellLoc='left', loc='center',
                          colWidths=[0.3, 0.2, 0.15, 0.35])
         table.auto_set_font_size(False)
         table.set_fontsize(10)
         table.scale(1, 2.5)
         
-        # Mise en forme
-        for i in range(4):
-            table[(0, i)].set_facecolor('#4CAF50')
-            table[(0, i)].set_text_props(weight='bold', color='white')
-        
-        for i in range(1, len(table_data)):
-            for j in range(4):
-                if i % 2 == 0:
-                    table[(i, j)].set_facecolor('#f0f0f0')
+        # Mise en forme : un seul parcours du dictionnaire des cellules
+        for (row, _), cell in table.get_celld().items():
+            if row == 0:
+                cell.set_text_props(weight='bold', color='white')
         
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✓ Graphique sauvegardé: {save_path}")
-        plt.close()
+        return self._save_figure(fig, save_path, return_bytes)
     
     def _draw_column_schematic(self, ax, results):
         """
         Dessine un schéma de la colonne de distillation
+        
+        Le schéma ne dépend que de quelques scalaires : il est dessiné une fois
+        avec Pillow puis réaffiché comme image aux appels suivants.
         """
-        ax.set_xlim([0, 1])
-        ax.set_ylim([0, 1])
+        key = (results['feed_stage'], results['N_real'], results['N_R'],
+               results['N_S'], round(results['R'], 2))
+        image = self._schema_cache.get(key)
+        if image is None:
+            image = np.asarray(self._render_column_schematic(results))
+            self._schema_cache[key] = image
+        
+        ax.imshow(image)
         ax.axis('off')
         ax.set_title('Schéma de la colonne', fontsize=12, fontweight='bold')
+    
+    def _render_column_schematic(self, results, size=(600, 1200), dpi=150):
+        """
+        Dessine le schéma de colonne directement avec Pillow
+        
+        Les coordonnées sont exprimées en fraction de l'image (origine en bas
+        à gauche) ; le dessin est fait à 2× puis réduit pour l'anticrénelage.
+        
+        Parameters:
+        -----------
+        results : dict
+            Résultats du dimensionnement (N_real, R, N_R, N_S, feed_stage)
+        size : tuple of int
+            Taille de l'image (pixels)
+        dpi : float
+            Résolution utilisée pour convertir les tailles en points
+        
+        Returns:
+        --------
+        image : PIL.Image.Image
+            Schéma en RGB
+        """
+        ss = 2
+        W, H = size[0] * ss, size[1] * ss
+        pt = dpi / 72 * ss  # pixels par point
+        img = Image.new('RGB', (W, H), 'white')
+        draw = ImageDraw.Draw(img)
+        
+        def px(x, y):
+            return x * W, (1 - y) * H
+        
+        def box(x, y, w, h):
+            (x0, y1), (x1, y0) = px(x, y), px(x + w, y + h)
+            return [x0, y0, x1, y1]
+        
+        def text(x, y, s, size, anchor='mm', fill='black', bold=True):
+            draw.text(px(x, y), s, fill=fill, anchor=anchor,
+                      font=_schematic_font(round(size * pt), bold))
+        
+        def arrow(x, y, dy, color):
+            # Flèche verticale : tige de longueur dy puis tête de 0.02 × 0.03
+            head = 0.02 if dy > 0 else -0.02
+            draw.line([px(x, y), px(x, y + dy)], fill=color, width=round(2 * pt))
+            draw.polygon([px(x - 0.015, y + dy), px(x + 0.015, y + dy),
+                          px(x, y + dy + head)], fill=color)
         
         # Corps de la colonne
         col_width = 0.25
@@ -242,10 +511,10 @@ class DistillationVisualizer:
         col_x = 0.375
         col_y = 0.15
         
-        column = FancyBboxPatch((col_x, col_y), col_width, col_height,
-                                boxstyle="round,pad=0.01", edgecolor='black',
-                                facecolor='lightblue', linewidth=2.5)
-        ax.add_patch(column)
+        draw.rounded_rectangle(box(col_x - 0.01, col_y - 0.005,
+                                   col_width + 0.02, col_height + 0.01),
+                               radius=0.01 * W, fill='lightblue',
+                               outline='black', width=round(2.5 * pt))
         
         # Condenseur
         cond_width = col_width + 0.1
@@ -253,11 +522,9 @@ class DistillationVisualizer:
         cond_x = col_x - 0.05
         cond_y = col_y + col_height
         
-        condenseur = Rectangle((cond_x, cond_y), cond_width, cond_height,
-                               facecolor='lightgreen', edgecolor='black', linewidth=2)
-        ax.add_patch(condenseur)
-        ax.text(col_x + col_width/2, cond_y + cond_height/2, 'Condenseur',
-                ha='center', va='center', fontsize=9, fontweight='bold')
+        draw.rectangle(box(cond_x, cond_y, cond_width, cond_height),
+                       fill='lightgreen', outline='black', width=round(2 * pt))
+        text(col_x + col_width/2, cond_y + cond_height/2, 'Condenseur', 9)
         
         # Rebouilleur
         reb_width = cond_width
@@ -265,39 +532,41 @@ class DistillationVisualizer:
         reb_x = cond_x
         reb_y = col_y - reb_height
         
-        rebouilleur = Rectangle((reb_x, reb_y), reb_width, reb_height,
-                                facecolor='lightcoral', edgecolor='black', linewidth=2)
-        ax.add_patch(rebouilleur)
-        ax.text(col_x + col_width/2, reb_y + reb_height/2, 'Rebouilleur',
-                ha='center', va='center', fontsize=9, fontweight='bold')
+        draw.rectangle(box(reb_x, reb_y, reb_width, reb_height),
+                       fill='lightcoral', outline='black', width=round(2 * pt))
+        text(col_x + col_width/2, reb_y + reb_height/2, 'Rebouilleur', 9)
         
         # Plateau d'alimentation
         feed_ratio = results['feed_stage'] / results['N_real']
         feed_y = col_y + col_height * (1 - feed_ratio)
         
-        ax.plot([col_x - 0.15, col_x], [feed_y, feed_y], 'b-', linewidth=3)
-        ax.plot(col_x - 0.15, feed_y, 'bo', markersize=8)
-        ax.text(col_x - 0.18, feed_y, 'F', ha='right', va='center',
-               fontsize=11, fontweight='bold', color='blue')
+        draw.line([px(col_x - 0.15, feed_y), px(col_x, feed_y)],
+                  fill='blue', width=round(3 * pt))
+        cx, cy = px(col_x - 0.15, feed_y)
+        r = 4 * pt
+        draw.ellipse([cx - r, cy - r, cx + r, cy + r], fill='blue')
+        text(col_x - 0.18, feed_y, 'F', 11, anchor='rm', fill='blue')
         
         # Distillat
-        ax.arrow(col_x + col_width/2, cond_y + cond_height, 0, 0.04,
-                head_width=0.03, head_length=0.02, fc='green', ec='green', linewidth=2)
-        ax.text(col_x + col_width/2, cond_y + cond_height + 0.07, 'D',
-                ha='center', va='center', fontsize=11, fontweight='bold', color='green')
+        arrow(col_x + col_width/2, cond_y + cond_height, 0.04, 'green')
+        text(col_x + col_width/2, cond_y + cond_height + 0.07, 'D', 11, fill='green')
         
         # Résidu
-        ax.arrow(col_x + col_width/2, reb_y, 0, -0.04,
-                head_width=0.03, head_length=0.02, fc='red', ec='red', linewidth=2)
-        ax.text(col_x + col_width/2, reb_y - 0.07, 'B',
-                ha='center', va='center', fontsize=11, fontweight='bold', color='red')
-        
-        # Reflux
-        ax.annotate('', xy=(col_x + col_width + 0.02, col_y + col_height - 0.05),
-                   xytext=(col_x + col_width + 0.02, cond_y + cond_height/2),
-                   arrowprops=dict(arrowstyle='->', lw=2, color='purple', linestyle='--'))
-        ax.text(col_x + col_width + 0.08, col_y + col_height - 0.02, 'Reflux',
-                ha='left', va='center', fontsize=8, color='purple')
+        arrow(col_x + col_width/2, reb_y, -0.04, 'red')
+        text(col_x + col_width/2, reb_y - 0.07, 'B', 11, fill='red')
+        
+        # Reflux (tirets, pointe ouverte)
+        x_r = col_x + col_width + 0.02
+        y_start, y_end = cond_y + cond_height/2, col_y + col_height - 0.05
+        dash = 0.012
+        for y in np.arange(y_start, y_end, -2 * dash):
+            draw.line([px(x_r, y), px(x_r, max(y - dash, y_end))],
+                      fill='purple', width=round(2 * pt))
+        for side in (-1, 1):
+            draw.line([px(x_r + side * 0.012, y_end + 0.012), px(x_r, y_end)],
+                      fill='purple', width=round(2 * pt))
+        text(col_x + col_width + 0.08, col_y + col_height - 0.02, 'Reflux', 8,
+             anchor='lm', fill='purple', bold=False)
         
         # Informations
         info_text = f"""N total = {results['N_real']}
@@ -306,24 +575,40 @@ N_rect = {results['N_R']}
 N_strip = {results['N_S']}
 Plateau alim = {results['feed_stage']}"""
         
-        ax.text(0.05, 0.5, info_text, fontsize=9, verticalalignment='center',
-                family='monospace',
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+        font = _schematic_font(round(9 * pt), mono=True)
+        spacing = round(3 * pt)
+        x0, y0, x1, y1 = draw.multiline_textbbox(px(0.05, 0.5), info_text,
+                                                 font=font, anchor='lm',
+                                                 spacing=spacing)
+        pad = 0.3 * 9 * pt
+        draw.rounded_rectangle([x0 - pad, y0 - pad, x1 + pad, y1 + pad],
+                               radius=pad, fill=(247, 228, 194),
+                               outline='black', width=round(pt))
+        draw.multiline_text(px(0.05, 0.5), info_text, fill='black',
+                            font=font, anchor='lm', spacing=spacing)
+        
+        return img.reduce(ss)
     
+    @_with_profile_rc
     def plot_composition_profiles_matplotlib(self, stages, x_profiles, y_profiles,
-                                            feed_stage, save_path='composition_profiles.png'):
+                                            feed_stage, save_path='composition_profiles.png',
+                                            return_bytes=False):
         """
         Trace les profils de composition avec matplotlib
+        
+        Avec return_bytes=True, l'image PNG est renvoyée (bytes) au lieu
+        d'être écrite dans save_path.
         """
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 8))
+        fig, (ax1, ax2) = self._get_figure((14, 8), 1, 2)
         fig.suptitle('Profils de Composition dans la Colonne',
                      fontsize=14, fontweight='bold')
         
-        # Profils liquides
-        for i in range(self.n_comp):
-            ax1.plot(x_profiles[:, i], stages, 'o-', linewidth=2.5,
-                    markersize=5, label=self.compound_names[i],
-                    color=self.colors[i])
+        # Profils liquides : un seul appel plot pour tous les composés
+        # (une ligne par colonne, couleurs via le cycle de propriétés)
+        st, x_plot = downsample_profile(stages, x_profiles)
+        ax1.set_prop_cycle(color=self.colors_hex)
+        ax1.plot(x_plot, st, 'o-', linewidth=2.5,
+                markersize=5, label=self.compound_names)
         
         ax1.axhline(y=feed_stage, color='blue', linestyle='--', linewidth=2,
                    label='Plateau alimentation')
@@ -336,10 +621,10 @@ Plateau alim = {results['feed_stage']}"""
         ax1.set_xlim([0, 1])
         
         # Profils vapeur
-        for i in range(self.n_comp):
-            ax2.plot(y_profiles[:, i], stages, 's-', linewidth=2.5,
-                    markersize=5, label=self.compound_names[i],
-                    color=self.colors[i])
+        st, y_plot = downsample_profile(stages, y_profiles)
+        ax2.set_prop_cycle(color=self.colors_hex)
+        ax2.plot(y_plot, st, 's-', linewidth=2.5,
+                markersize=5, label=self.compound_names)
         
         ax2.axhline(y=feed_stage, color='blue', linestyle='--', linewidth=2,
                    label='Plateau alimentation')
@@ -351,121 +636,116 @@ Plateau alim = {results['feed_stage']}"""
         ax2.invert_yaxis()
         ax2.set_xlim([0, 1])
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✓ Graphique sauvegardé: {save_path}")
-        plt.close()
+        fig.tight_layout()
+        return self._save_figure(fig, save_path, return_bytes)
     
-    def plot_composition_profiles_plotly(self, stages, x_profiles, y_profiles, feed_stage):
+    def plot_composition_profiles_plotly(self, stages, x_profiles, y_profiles, feed_stage,
+                                        show=False):
         """
         Trace les profils de composition avec Plotly (interactif)
+        
+        Le fichier HTML charge plotly.js depuis le CDN ; show=True ouvre
+        en plus la figure dans le navigateur.
+        
+        Returns:
+        --------
+        fig : dict
+            Figure Plotly au format dictionnaire {'data', 'layout'}
+            (utilisable avec plotly.io ou go.Figure(fig))
         """
-        if not PLOTLY_AVAILABLE:
+        if not _lazy_plotly():
             print("⚠ Plotly non disponible, utiliser plot_composition_profiles_matplotlib")
             return None
         
-        # Créer subplots
-        fig = make_subplots(
-            rows=1, cols=2,
-            subplot_titles=('Phase Liquide', 'Phase Vapeur'),
-            horizontal_spacing=0.12
-        )
-        
-        # Phase liquide
-        for i in range(self.n_comp):
-            fig.add_trace(
-                go.Scatter(
-                    x=x_profiles[:, i],
-                    y=stages,
-                    mode='lines+markers',
-                    name=self.compound_names[i],
-                    line=dict(color=self.plotly_colors[i], width=2.5),
-                    marker=dict(size=6),
-                    legendgroup='compounds',
-                    showlegend=True
-                ),
-                row=1, col=1
-            )
-        
-        # Ligne plateau alimentation
-        fig.add_trace(
-            go.Scatter(
-                x=[0, 1],
-                y=[feed_stage, feed_stage],
-                mode='lines',
-                name='Plateau alimentation',
-                line=dict(color='blue', width=2, dash='dash'),
-                legendgroup='feed',
-                showlegend=True
-            ),
-            row=1, col=1
-        )
-        
-        # Phase vapeur
-        for i in range(self.n_comp):
-            fig.add_trace(
-                go.Scatter(
-                    x=y_profiles[:, i],
-                    y=stages,
-                    mode='lines+markers',
-                    name=self.compound_names[i],
-                    line=dict(color=self.plotly_colors[i], width=2.5, dash='dot'),
-                    marker=dict(size=6, symbol='square'),
-                    legendgroup='compounds',
-                    showlegend=False
-                ),
-                row=1, col=2
-            )
-        
-        # Ligne plateau alimentation
-        fig.add_trace(
-            go.Scatter(
-                x=[0, 1],
-                y=[feed_stage, feed_stage],
-                mode='lines',
-                name='Plateau alimentation',
-                line=dict(color='blue', width=2, dash='dash'),
-                legendgroup='feed',
-                showlegend=False
-            ),
-            row=1, col=2
-        )
-        
-        # Mise en forme
-        fig.update_xaxes(title_text='Fraction molaire liquide (x)', row=1, col=1,
-                        range=[0, 1])
-        fig.update_xaxes(title_text='Fraction molaire vapeur (y)', row=1, col=2,
-                        range=[0, 1])
-        fig.update_yaxes(title_text='Numéro de plateau', row=1, col=1,
-                        autorange='reversed')
-        fig.update_yaxes(title_text='Numéro de plateau', row=1, col=2,
-                        autorange='reversed')
-        
-        fig.update_layout(
-            title_text='Profils de Composition dans la Colonne (Interactif)',
-            title_font_size=16,
-            height=600,
-            hovermode='closest',
-            template='plotly_white'
-        )
-        
-        # Sauvegarder en HTML
-        fig.write_html('composition_profiles_interactive.html')
+        # Figure construite en dictionnaires bruts (sans validation graph_objs) :
+        # deux sous-graphes côte à côte via les domaines des axes. Traces WebGL
+        # (scattergl) : le rendu reste fluide pour les colonnes à nombreux plateaux
+        data = []
+        for col, (profiles, xaxis, yaxis) in enumerate(
+                ((x_profiles, 'x', 'y'), (y_profiles, 'x2', 'y2'))):
+            liquid = col == 0
+            for i in range(self.n_comp):
+                st, values = downsample_profile(stages, profiles[:, i])
+                data.append({
+                    'type': 'scattergl',
+                    'x': values,
+                    'y': st,
+                    'mode': 'lines+markers',
+                    'name': self.compound_names[i],
+                    'line': {'color': self.colors_hex[i], 'width': 2.5,
+                             'dash': 'solid' if liquid else 'dot'},
+                    'marker': {'size': 6, 'symbol': 'circle' if liquid else 'square'},
+                    'legendgroup': 'compounds',
+                    'showlegend': liquid,
+                    'xaxis': xaxis,
+                    'yaxis': yaxis
+                })
+            
+            # Ligne plateau alimentation
+            data.append({
+                'type': 'scattergl',
+                'x': [0, 1],
+                'y': [feed_stage, feed_stage],
+                'mode': 'lines',
+                'name': 'Plateau alimentation',
+                'line': {'color': 'blue', 'width': 2, 'dash': 'dash'},
+                'legendgroup': 'feed',
+                'showlegend': liquid,
+                'xaxis': xaxis,
+                'yaxis': yaxis
+            })
+        
+        subplot_title = {'xref': 'paper', 'yref': 'paper', 'y': 1.0,
+                         'yanchor': 'bottom', 'showarrow': False,
+                         'font': {'size': 16}}
+        layout = {
+            'title': {'text': 'Profils de Composition dans la Colonne (Interactif)',
+                      'font': {'size': 16}},
+            'xaxis': {'domain': [0, 0.44], 'range': [0, 1], 'anchor': 'y',
+                      'title': {'text': 'Fraction molaire liquide (x)'}},
+            'xaxis2': {'domain': [0.56, 1], 'range': [0, 1], 'anchor': 'y2',
+                       'title': {'text': 'Fraction molaire vapeur (y)'}},
+            'yaxis': {'anchor': 'x', 'autorange': 'reversed',
+                      'title': {'text': 'Numéro de plateau'}},
+            'yaxis2': {'anchor': 'x2', 'autorange': 'reversed',
+                       'title': {'text': 'Numéro de plateau'}},
+            'annotations': [
+                dict(subplot_title, text='Phase Liquide', x=0.22, xanchor='center'),
+                dict(subplot_title, text='Phase Vapeur', x=0.78, xanchor='center')
+            ],
+            'height': 600,
+            'hovermode': 'closest',
+            'template': pio.templates['plotly_white'].to_plotly_json()
+        }
+        fig = {'data': data, 'layout': layout}
+        
+        # Sauvegarder en HTML (plotly.js chargé depuis le CDN, non embarqué)
+        pio.write_html(fig, 'composition_profiles_interactive.html',
+                       include_plotlyjs='cdn', full_html=True, auto_play=False,
+                       auto_open=False, validate=False)
         print("✓ Graphique interactif sauvegardé: composition_profiles_interactive.html")
         
         # Afficher
-        fig.show()
+        if show:
+            pio.show(fig, validate=False)
         
         return fig
     
+    @_with_profile_rc
     def plot_temperature_profile(self, stages, temperatures, feed_stage,
-                                save_path='temperature_profile.png'):
+                                save_path='temperature_profile.png', return_bytes=False):
         """
         Trace le profil de température
+        
+        Avec return_bytes=True, l'image PNG est renvoyée (bytes) au lieu
+        d'être écrite dans save_path.
         """
-        fig, ax = plt.subplots(figsize=(8, 10))
+        fig, ax = self._get_figure((8, 10), 1, 1)
         
-        ax.plot(temperatures - 273.15, stages, 'o-', linewidth=3,
+        # Conversion K → °C une seule fois (float32 : précision suffisante au tracé)
+        T_C = np.subtract(temperatures, 273.15, dtype=np.float32)
+        st, T_plot = downsample_profile(stages, T_C)
+        ax.plot(T_plot, st, 'o-', linewidth=3,
                 markersize=8, color='orangered', label='Température')
         
         ax.axhline(y=feed_stage, color='blue', linestyle='--', linewidth=2,
@@ -480,55 +760,57 @@ Plateau alim = {results['feed_stage']}"""
         ax.invert_yaxis()
         
         # Annotations
-        T_top = temperatures[0] - 273.15
-        T_bottom = temperatures[-1] - 273.15
+        T_top = T_C[0]
+        T_bottom = T_C[-1]
         ax.text(T_top, 1, f'  {T_top:.1f}°C', ha='left', va='center',
                fontsize=10, fontweight='bold', color='darkred')
         ax.text(T_bottom, len(stages), f'  {T_bottom:.1f}°C', ha='left', va='center',
                fontsize=10, fontweight='bold', color='darkred')
         
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"✓ Graphique sauvegardé: {save_path}")
-        plt.close()
+        fig.tight_layout()
+        return self._save_figure(fig, save_path, return_bytes)
 
 def print_design_summary(shortcut_results, compound_names):
     """
     Affiche un résumé formaté du dimensionnement
     """
-    print("\n" + "╔" + "═" * 78 + "╗")
-    print("║" + "  RÉSUMÉ DU DIMENSIONNEMENT DE LA COLONNE".center(78) + "║")
-    print("╚" + "═" * 78 + "╝")
+    # Résumé assemblé puis écrit en une seule fois
+    out = []
+    w = out.append
+    w("\n" + "╔" + "═" * 78 + "╗")
+    w("║" + "  RÉSUMÉ DU DIMENSIONNEMENT DE LA COLONNE".center(78) + "║")
+    w("╚" + "═" * 78 + "╝")
     
-    print(f"\n{'BILANS MATIÈRES':-^80}")
-    print(f"  • Débit alimentation:      {shortcut_results['D'] + shortcut_results['B']:.2f} kmol/h")
-    print(f"  • Débit distillat:         {shortcut_results['D']:.2f} kmol/h")
-    print(f"  • Débit résidu:            {shortcut_results['B']:.2f} kmol/h")
+    w(f"\n{'BILANS MATIÈRES':-^80}")
+    w(f"  • Débit alimentation:      {shortcut_results['D'] + shortcut_results['B']:.2f} kmol/h")
+    w(f"  • Débit distillat:         {shortcut_results['D']:.2f} kmol/h")
+    w(f"  • Débit résidu:            {shortcut_results['B']:.2f} kmol/h")
     
-    print(f"\n{'COMPOSITION DISTILLAT':-^80}")
-    for i, name in enumerate(compound_names):
-        print(f"  • {name:15s}: {shortcut_results['x_D'][i]*100:6.2f}%")
+    w(f"\n{'COMPOSITION DISTILLAT':-^80}")
+    out.extend(f"  • {name:15s}: {x*100:6.2f}%"
+               for name, x in zip(compound_names, shortcut_results['x_D']))
     
-    print(f"\n{'COMPOSITION RÉSIDU':-^80}")
-    for i, name in enumerate(compound_names):
-        print(f"  • {name:15s}: {shortcut_results['x_B'][i]*100:6.2f}%")
+    w(f"\n{'COMPOSITION RÉSIDU':-^80}")
+    out.extend(f"  • {name:15s}: {x*100:6.2f}%"
+               for name, x in zip(compound_names, shortcut_results['x_B']))
     
-    print(f"\n{'PARAMÈTRES DE CONCEPTION':-^80}")
-    print(f"  • N minimum (Fenske):      {shortcut_results['N_min']:.2f} plateaux")
-    print(f"  • R minimum (Underwood):   {shortcut_results['R_min']:.3f}")
-    print(f"  • R opératoire:            {shortcut_results['R']:.3f}")
-    print(f"  • N théorique (Gilliland): {shortcut_results['N_theoretical']:.2f} plateaux")
-    print(f"  • Efficacité:              {shortcut_results['efficiency']*100:.1f}%")
-    print(f"  • N réel:                  {shortcut_results['N_real']} plateaux")
+    w(f"\n{'PARAMÈTRES DE CONCEPTION':-^80}")
+    w(f"  • N minimum (Fenske):      {shortcut_results['N_min']:.2f} plateaux")
+    w(f"  • R minimum (Underwood):   {shortcut_results['R_min']:.3f}")
+    w(f"  • R opératoire:            {shortcut_results['R']:.3f}")
+    w(f"  • N théorique (Gilliland): {shortcut_results['N_theoretical']:.2f} plateaux")
+    w(f"  • Efficacité:              {shortcut_results['efficiency']*100:.1f}%")
+    w(f"  • N réel:                  {shortcut_results['N_real']} plateaux")
     
-    print(f"\n{'LOCALISATION':-^80}")
-    print(f"  • Plateaux rectification:  {shortcut_results['N_R']}")
-    print(f"  • Plateaux épuisement:     {shortcut_results['N_S']}")
-    print(f"  • Plateau alimentation:    {shortcut_results['feed_stage']}")
+    w(f"\n{'LOCALISATION':-^80}")
+    w(f"  • Plateaux rectification:  {shortcut_results['N_R']}")
+    w(f"  • Plateaux épuisement:     {shortcut_results['N_S']}")
+    w(f"  • Plateau alimentation:    {shortcut_results['feed_stage']}")
     
-    print(f"\n{'DÉBITS INTERNES':-^80}")
-    print(f"  • Liquide rectification:   {shortcut_results['L']:.2f} kmol/h")
-    print(f"  • Vapeur rectification:    {shortcut_results['V']:.2f} kmol/h")
-    print(f"  • Liquide épuisement:      {shortcut_results['L_prime']:.2f} kmol/h")
+    w(f"\n{'DÉBITS INTERNES':-^80}")
+    w(f"  • Liquide rectification:   {shortcut_results['L']:.2f} kmol/h")
+    w(f"  • Vapeur rectification:    {shortcut_results['V']:.2f} kmol/h")
+    w(f"  • Liquide épuisement:      {shortcut_results['L_prime']:.2f} kmol/h")
     
-    print("\n" + "=" * 80)
\ No newline at end of file
+    w("\n" + "=" * 80)
+    sys.stdout.write('\n'.join(out) + '\n')
\ No newline at end of file